@@ -6,7 +6,6 @@ from pathlib import Path
 from typing import Optional
 
 import typer
-import yaml
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
@@ -65,7 +64,7 @@ def download(
     """Download a package from its manifest."""
     try:
         from .core.codesign import verify_signature_requirements
-        from .core.downloader import download_file, verify_checksum
+        from .core.downloader import check_checksum, download_file
         from .core.manifests import Manifest
 
         manifest = Manifest.from_yaml(manifest_path)
@@ -80,14 +79,14 @@ def download(
                 TextColumn("[progress.description]{task.description}"),
                 console=console,
             ) as progress:
-                await download_file(str(manifest.url), dest_path, progress)
+                _, actual_checksum = await download_file(str(manifest.url), dest_path, progress)
 
             console.print(f"Successfully downloaded to {dest_path}")
 
             if not skip_verify:
                 # Verify checksum
                 if manifest.checksum:
-                    if verify_checksum(dest_path, manifest.checksum):
+                    if check_checksum(dest_path, actual_checksum, manifest.checksum):
                         console.print("[green]Checksum verification passed!")
                     else:
                         console.print("[red]Warning: Checksum verification failed!")
@@ -271,7 +270,10 @@ def check_updates(
                             current_version=update_info.current_version,
                             new_version=update_info.latest_version,
                         )
-                        await notification_service.provider.notify(notification)
+                        try:
+                            await notification_service.provider.notify(notification)
+                        finally:
+                            await notification_service.close()
                         console.print("[green]Notification sent[/green]")
 
                     if build_if_needed:
@@ -281,8 +283,11 @@ def check_updates(
                         manifest.checksum = None  # Will be verified after download
 
                         # Write updated manifest
+                        import yaml
+
                         with open(manifest_path, "w") as f:
-                            yaml.dump(manifest.dict(), f)
+                            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+                            yaml.dump(manifest.to_dict(), f, Dumper=dumper)
 
                         # Build new version
                         console.print("\n[green]Building new version...[/green]")
@@ -291,29 +296,30 @@ def check_updates(
                         # Record the update in the database if we have config
                         if config:
                             try:
-                                from .core.database import Database
+                                from .core.database import get_database
                                 from .core.updater import VersionTracker
 
-                                db = Database(Path(config.db_path))
+                                db = get_database(Path(config.db_path))
                                 version_tracker = VersionTracker(db)
 
                                 # Check if package exists in database
                                 package = db.get_package_by_name(manifest.name)
                                 if not package:
-                                    # Add the package to the database
-                                    pkg_id = db.add_package(
-                                        name=manifest.name,
-                                        version=update_info.latest_version,
-                                        status="installed",
-                                    )
-
-                                    # Add the version
-                                    db.add_package_version(
-                                        package_id=pkg_id,
-                                        version=update_info.latest_version,
-                                        url=update_info.download_url,
-                                        is_installed=True,
-                                    )
+                                    with db.transaction():
+                                        # Add the package to the database
+                                        pkg_id = db.add_package(
+                                            name=manifest.name,
+                                            version=update_info.latest_version,
+                                            status="installed",
+                                        )
+
+                                        # Add the version
+                                        db.add_package_version(
+                                            package_id=pkg_id,
+                                            version=update_info.latest_version,
+                                            url=update_info.download_url,
+                                            is_installed=True,
+                                        )
                                 else:
                                     # Record the version
                                     version_tracker.record_version(
@@ -337,6 +343,10 @@ def check_updates(
         except Exception as e:
             console.print(f"[red]Error checking for updates: {e}[/red]")
             raise typer.Exit(1) from e
+        finally:
+            from .core.updater import UpdateChecker
+
+            await UpdateChecker.aclose()
 
     asyncio.run(async_check())
 
@@ -499,7 +509,10 @@ def check_for_notifications():
                 service = NotificationService(config)
 
                 # Check for updates and send notifications
-                notification_count = await service.notify_updates()
+                try:
+                    notification_count = await service.notify_updates()
+                finally:
+                    await service.close()
 
                 progress.update(task_id, completed=True)
 
@@ -681,5 +694,41 @@ def notification_status():
         raise typer.Exit(1) from e
 
 
+@app.command(hidden=True)
+def batch():
+    """Run many commands in one process, for scripted callers such as the test suite.
+
+    Reads one JSON list of arguments per line from stdin and writes one JSON
+    object per line with the command's exit code and captured output.
+    """
+    import contextlib
+    import io
+    import json
+    import sys
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                rc = app(json.loads(line), prog_name="carrus", standalone_mode=False)
+                rc = rc if isinstance(rc, int) else 0
+            except typer.Abort:
+                rc = 1
+            except SystemExit as e:
+                rc = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception as e:
+                # Usage errors carry their own message and exit code
+                if hasattr(e, "show"):
+                    e.show()
+                else:
+                    print(f"Error: {e}", file=sys.stderr)
+                rc = getattr(e, "exit_code", 1)
+        result = {"rc": rc, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
 if __name__ == "__main__":
     app()
@@ -1,6 +1,7 @@
 # src/carrus/core/builder.py
 
 import os
+import plistlib
 import shutil
 import subprocess
 import tempfile
@@ -11,6 +12,7 @@ from typing import List, Tuple
 from rich.console import Console
 from rich.progress import Progress
 
+from .codesign import verify_codesign
 from .types import BuildConfig, BuildResult, BuildState, BuildStep, BuildType
 
 HDIUTIL_PATH = shutil.which("hdiutil")
@@ -73,6 +75,28 @@ def _run_cmd(cmd: List[str], description: str) -> Tuple[str, str, int]:
     return result.stdout, result.stderr, result.returncode
 
 
+def _installed_app_matches(app_path: Path, build_config: BuildConfig) -> bool:
+    """Check whether an installed app already matches the expected version and Team ID."""
+    if not build_config.version or not app_path.exists():
+        return False
+
+    try:
+        with open(app_path / "Contents" / "Info.plist", "rb") as f:
+            info_plist = plistlib.load(f)
+    except Exception:
+        return False
+
+    if info_plist.get("CFBundleShortVersionString") != build_config.version:
+        return False
+
+    if build_config.team_id:
+        info = verify_codesign(app_path, debug=False)
+        if not info.signed or info.team_id != build_config.team_id:
+            return False
+
+    return True
+
+
 class AppDmgBuilder:
     """Builds application packages from DMGs."""
 
@@ -265,6 +289,15 @@ async def build_package(
             return BuildResult(success=False, build_state=build_state, errors=[error])
 
         if build_type == BuildType.APP_DMG:
+            # Skip the mount and copy entirely if the destination is already current
+            if build_config.app_name:
+                dest_path = destination / build_config.app_name
+                if _installed_app_matches(dest_path, build_config):
+                    console.print(f"[green]{dest_path.name} is already up to date[/green]")
+                    build_state.current_step = BuildStep.CLEANUP
+                    progress.update(task_id, description="Already up to date")
+                    return BuildResult(success=True, output_path=dest_path, build_state=build_state)
+
             return await AppDmgBuilder.build(
                 source_path, destination, progress, task_id, build_state
             )
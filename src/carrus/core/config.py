@@ -1,11 +1,12 @@
 # src/carrus/core/config.py
+import copy
 import os
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from functools import cache
 from pathlib import Path
 from typing import Optional
 
-import yaml
-
 
 @dataclass
 class NotificationConfig:
@@ -23,6 +24,7 @@ class NotificationConfig:
     slack_channel: Optional[str] = None
     slack_username: str = "Carrus Update Bot"
     last_check: Optional[str] = None
+    max_concurrency: int = 8  # Notifications sent in parallel
 
 
 @dataclass
@@ -37,12 +39,43 @@ class Config:
     notifications: NotificationConfig = field(default_factory=NotificationConfig)
 
 
+# Parsed configs keyed by resolved path, invalidated on mtime/size change
+_CONFIG_CACHE: "OrderedDict[str, tuple[int, int, Config]]" = OrderedDict()
+_CONFIG_CACHE_MAX = 100
+
+
+@cache
+def _yaml():
+    """Import PyYAML on first use and pick the libyaml loader/dumper if available."""
+    import yaml
+
+    try:
+        from yaml import CSafeDumper as Dumper
+        from yaml import CSafeLoader as Loader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeDumper as Dumper
+        from yaml import SafeLoader as Loader
+
+    return yaml, Loader, Dumper
+
+
+@cache
 def get_config_dir() -> Path:
-    """Get the carrus configuration directory."""
+    """Get the carrus configuration directory.
+
+    Resolved once per process; call get_config_dir.cache_clear() after
+    changing XDG_CONFIG_HOME.
+    """
     xdg_config_home = os.environ.get("XDG_CONFIG_HOME", "~/.config")
     return Path(xdg_config_home).expanduser() / "carrus"
 
 
+def get_cache_dir() -> Path:
+    """Get the carrus cache directory."""
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME", "~/.cache")
+    return Path(xdg_cache_home).expanduser() / "carrus"
+
+
 def get_repo_dir() -> Path:
     """Get the repository storage directory."""
     return get_config_dir() / "repos"
@@ -61,48 +94,47 @@ def ensure_dirs() -> tuple[Path, Path]:
 
 def get_default_config() -> Config:
     """Get default configuration with environment variable overrides."""
-    db_path = os.environ.get("CARRUS_DB_PATH", str(get_config_dir() / "carrus.db"))
-    log_dir = os.environ.get("CARRUS_LOG_DIR", str(get_config_dir() / "logs"))
-    repo_url = os.environ.get("CARRUS_REPO_URL")
+    env = os.environ
+    config_dir = get_config_dir()
+    db_path = env.get("CARRUS_DB_PATH", str(config_dir / "carrus.db"))
+    log_dir = env.get("CARRUS_LOG_DIR", str(config_dir / "logs"))
+    repo_url = env.get("CARRUS_REPO_URL")
 
     # Create the basic config
     config = Config(db_path=db_path, log_dir=log_dir, repo_url=repo_url)
+    notifications = config.notifications
 
     # Apply notification environment variables if present
-    if os.environ.get("CARRUS_NOTIFICATION_ENABLED") is not None:
-        config.notifications.enabled = (
-            os.environ.get("CARRUS_NOTIFICATION_ENABLED").lower() == "true"
-        )
+    if (value := env.get("CARRUS_NOTIFICATION_ENABLED")) is not None:
+        notifications.enabled = value.lower() == "true"
 
-    if os.environ.get("CARRUS_NOTIFICATION_METHOD"):
-        config.notifications.method = os.environ.get("CARRUS_NOTIFICATION_METHOD")
+    if value := env.get("CARRUS_NOTIFICATION_METHOD"):
+        notifications.method = value
 
     # Email settings
-    if os.environ.get("CARRUS_NOTIFICATION_EMAIL"):
-        config.notifications.email = os.environ.get("CARRUS_NOTIFICATION_EMAIL")
+    if value := env.get("CARRUS_NOTIFICATION_EMAIL"):
+        notifications.email = value
 
     # GitHub settings
-    if os.environ.get("CARRUS_GITHUB_TOKEN"):
-        config.notifications.github_token = os.environ.get("CARRUS_GITHUB_TOKEN")
-    if os.environ.get("CARRUS_GITHUB_REPO"):
-        config.notifications.github_repo = os.environ.get("CARRUS_GITHUB_REPO")
-    if os.environ.get("CARRUS_GITHUB_ISSUE_LABEL"):
-        config.notifications.github_issue_label = os.environ.get("CARRUS_GITHUB_ISSUE_LABEL")
+    if value := env.get("CARRUS_GITHUB_TOKEN"):
+        notifications.github_token = value
+    if value := env.get("CARRUS_GITHUB_REPO"):
+        notifications.github_repo = value
+    if value := env.get("CARRUS_GITHUB_ISSUE_LABEL"):
+        notifications.github_issue_label = value
 
     # Slack settings
-    if os.environ.get("CARRUS_SLACK_WEBHOOK_URL"):
-        config.notifications.slack_webhook_url = os.environ.get("CARRUS_SLACK_WEBHOOK_URL")
-    if os.environ.get("CARRUS_SLACK_CHANNEL"):
-        config.notifications.slack_channel = os.environ.get("CARRUS_SLACK_CHANNEL")
-    if os.environ.get("CARRUS_SLACK_USERNAME"):
-        config.notifications.slack_username = os.environ.get("CARRUS_SLACK_USERNAME")
+    if value := env.get("CARRUS_SLACK_WEBHOOK_URL"):
+        notifications.slack_webhook_url = value
+    if value := env.get("CARRUS_SLACK_CHANNEL"):
+        notifications.slack_channel = value
+    if value := env.get("CARRUS_SLACK_USERNAME"):
+        notifications.slack_username = value
 
     # Check interval
-    if os.environ.get("CARRUS_NOTIFICATION_CHECK_INTERVAL"):
+    if value := env.get("CARRUS_NOTIFICATION_CHECK_INTERVAL"):
         try:
-            config.notifications.check_interval = int(
-                os.environ.get("CARRUS_NOTIFICATION_CHECK_INTERVAL")
-            )
+            notifications.check_interval = int(value)
         except ValueError:
             pass  # Use default if invalid
 
@@ -111,35 +143,33 @@ def get_default_config() -> Config:
 
 def load_config(config_path: Path) -> Config:
     """Load configuration from YAML file."""
+    config_path = Path(config_path)
+    st = config_path.stat()
+    key = str(config_path.resolve())
+
+    cached = _CONFIG_CACHE.get(key)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        _CONFIG_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
+    yaml, loader, _ = _yaml()
     with open(config_path, "r") as f:
-        config_data = yaml.safe_load(f)
+        config_data = yaml.load(f, Loader=loader)
+
+    config = Config(**config_data)
+
+    _CONFIG_CACHE[key] = (st.st_mtime_ns, st.st_size, config)
+    _CONFIG_CACHE.move_to_end(key)
+    if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+        _CONFIG_CACHE.popitem(last=False)
 
-    return Config(**config_data)
+    return copy.deepcopy(config)
 
 
 def save_config(config: Config, config_path: Path) -> None:
     """Save configuration to YAML file."""
-    notification_dict = {
-        "enabled": config.notifications.enabled,
-        "check_interval": config.notifications.check_interval,
-        "notify_on_startup": config.notifications.notify_on_startup,
-        "method": config.notifications.method,
-        "email": config.notifications.email,
-        "github_token": config.notifications.github_token,
-        "github_repo": config.notifications.github_repo,
-        "github_issue_label": config.notifications.github_issue_label,
-        "slack_webhook_url": config.notifications.slack_webhook_url,
-        "slack_channel": config.notifications.slack_channel,
-        "slack_username": config.notifications.slack_username,
-        "last_check": config.notifications.last_check,
-    }
-
-    config_dict = {
-        "db_path": config.db_path,
-        "log_dir": config.log_dir,
-        "repo_url": config.repo_url,
-        "notifications": notification_dict,
-    }
+    _CONFIG_CACHE.pop(str(Path(config_path).resolve()), None)
 
+    yaml, _, dumper = _yaml()
     with open(config_path, "w") as f:
-        yaml.dump(config_dict, f)
+        yaml.dump(asdict(config), f, Dumper=dumper, sort_keys=False, default_flow_style=False)
@@ -1,14 +1,301 @@
 """Database management and schema for Carrus."""
 
+import atexit
+import json
 import logging
 import sqlite3
-from contextlib import contextmanager
+import threading
+from contextlib import closing, contextmanager, suppress
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 6
+
+# Per-connection settings; journal_mode=WAL is persisted in the file by _init_db
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Statements used by Database methods. Keeping them as module constants
+# lets every call hand sqlite3 the same string for its statement cache.
+_UPSERT_VERSION = """
+    INSERT INTO versions (package_id, version, url, checksum, release_date, is_installed)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(package_id, version) DO UPDATE SET
+        url = excluded.url,
+        checksum = excluded.checksum,
+        release_date = excluded.release_date,
+        is_installed = excluded.is_installed
+"""
+
+_SQL = {
+    "add_package": """
+        INSERT INTO packages (name, version, install_path, checksum, status)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    "upsert_package": """
+        INSERT INTO packages (name, version, install_path, checksum, status)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(name, version) DO UPDATE SET
+            install_path = excluded.install_path,
+            checksum = excluded.checksum,
+            status = excluded.status,
+            updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+        RETURNING id
+    """,
+    "update_package_status": """
+        UPDATE packages
+        SET status = ?, updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+        WHERE id = ?
+    """,
+    "add_install_history": """
+        INSERT INTO install_history (package_id, version, action, status, error_message)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    "package_history": """
+        SELECT * FROM install_history
+        WHERE package_id = ?
+        ORDER BY id DESC
+    """,
+    "upsert_version": _UPSERT_VERSION,
+    "upsert_version_returning_id": _UPSERT_VERSION + "RETURNING id",
+    "package_versions": """
+        SELECT * FROM versions
+        WHERE package_id = ?
+        ORDER BY id DESC
+    """,
+    "latest_version": """
+        SELECT * FROM versions
+        WHERE package_id = ?
+        ORDER BY id DESC
+        LIMIT 1
+    """,
+    "installed_version": """
+        SELECT * FROM versions
+        WHERE package_id = ? AND is_installed = 1
+        ORDER BY created_at DESC
+        LIMIT 1
+    """,
+    # Ids are passed as one JSON array so the statement text never changes
+    "installed_versions": """
+        SELECT * FROM versions
+        WHERE is_installed = 1 AND package_id IN (SELECT value FROM json_each(?))
+        ORDER BY package_id, created_at DESC
+    """,
+    # Latest version row (prefixed columns) and installed version of each package
+    # that has one installed; both lookups are served by the versions indexes
+    "update_candidates": """
+        SELECT p.*,
+            lv.id AS latest_id,
+            lv.version AS latest_version,
+            lv.url AS latest_url,
+            lv.checksum AS latest_checksum,
+            lv.release_date AS latest_release_date,
+            lv.is_installed AS latest_is_installed,
+            lv.created_at AS latest_created_at,
+            iv.version AS installed_version
+        FROM packages p
+        JOIN versions lv ON lv.id = (
+            SELECT id FROM versions WHERE package_id = p.id ORDER BY id DESC LIMIT 1
+        )
+        JOIN versions iv ON iv.id = (
+            SELECT id FROM versions
+            WHERE package_id = p.id AND is_installed = 1
+            ORDER BY created_at DESC
+            LIMIT 1
+        )
+        WHERE lv.id != iv.id
+        ORDER BY p.id
+    """,
+    "mark_version_installed": """
+        UPDATE versions
+        SET is_installed = CASE WHEN id = ? THEN 1 ELSE 0 END
+        WHERE package_id = (SELECT package_id FROM versions WHERE id = ?)
+    """,
+    "unmark_version_installed": """
+        UPDATE versions
+        SET is_installed = 0
+        WHERE id = ?
+    """,
+    "package_by_name": """
+        SELECT * FROM packages
+        WHERE name = ?
+    """,
+    "packages_by_names": """
+        SELECT * FROM packages
+        WHERE name IN (SELECT value FROM json_each(?))
+        ORDER BY id
+    """,
+}
+
+# versions columns returned with a latest_ prefix by the update_candidates query
+_LATEST_VERSION_COLUMNS = (
+    "id",
+    "version",
+    "url",
+    "checksum",
+    "release_date",
+    "is_installed",
+    "created_at",
+)
+
+# Schema migrations as (version, script) pairs. _apply_migrations runs every
+# script newer than the stored version as a single executescript call.
+_MIGRATIONS = [
+    # Core tables
+    (
+        1,
+        """
+        CREATE TABLE IF NOT EXISTS packages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            version TEXT NOT NULL,
+            install_path TEXT,
+            install_date TIMESTAMP,
+            checksum TEXT,
+            status TEXT DEFAULT 'not_installed',
+            created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+            updated_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+            UNIQUE(name, version)
+        );
+
+        CREATE TABLE IF NOT EXISTS versions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            package_id INTEGER NOT NULL,
+            version TEXT NOT NULL,
+            url TEXT NOT NULL,
+            checksum TEXT,
+            release_date TIMESTAMP,
+            is_installed BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(package_id) REFERENCES packages(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS metadata (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            package_id INTEGER NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(package_id) REFERENCES packages(id) ON DELETE CASCADE,
+            UNIQUE(package_id, key)
+        );
+
+        CREATE TABLE IF NOT EXISTS install_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            package_id INTEGER NOT NULL,
+            version TEXT NOT NULL,
+            action TEXT NOT NULL,
+            status TEXT NOT NULL,
+            error_message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(package_id) REFERENCES packages(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS repositories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            url TEXT,
+            path TEXT NOT NULL,
+            branch TEXT,
+            last_sync TIMESTAMP,
+            active BOOLEAN DEFAULT 1,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS manifests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            repo_id INTEGER NOT NULL,
+            category TEXT,
+            path TEXT NOT NULL,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY(repo_id) REFERENCES repositories(id) ON DELETE CASCADE,
+            UNIQUE(name, repo_id)
+        );
+        """,
+    ),
+    # Lookup indexes (packages.name is already covered by UNIQUE(name, version))
+    (
+        2,
+        """
+        CREATE INDEX IF NOT EXISTS idx_versions_pkg
+        ON versions(package_id, id DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_versions_pkg_installed
+        ON versions(package_id, created_at DESC)
+        WHERE is_installed = 1;
+
+        CREATE INDEX IF NOT EXISTS idx_history_pkg
+        ON install_history(package_id, id DESC);
+        """,
+    ),
+    # One row per package version, required for upserts
+    (
+        3,
+        """
+        DELETE FROM versions
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM versions GROUP BY package_id, version
+        );
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_versions_pkg_version
+        ON versions(package_id, version);
+        """,
+    ),
+    # Timestamps are set by the UPDATE statements themselves
+    (
+        4,
+        """
+        DROP TRIGGER IF EXISTS update_package_timestamp;
+        DROP TRIGGER IF EXISTS update_metadata_timestamp;
+        DROP TRIGGER IF EXISTS update_repository_timestamp;
+        """,
+    ),
+    # Foreign key lookup on manifests (metadata is covered by UNIQUE(package_id, key))
+    (
+        5,
+        """
+        CREATE INDEX IF NOT EXISTS idx_manifests_repo
+        ON manifests(repo_id);
+        """,
+    ),
+    # Schema version is tracked in PRAGMA user_version
+    (
+        6,
+        """
+        DROP TABLE IF EXISTS schema_version;
+        """,
+    ),
+]
+
+FETCH_BATCH_SIZE = 256
+STATEMENT_CACHE_SIZE = 256
+BACKUP_PAGES_PER_STEP = 1024
+# Pause before retrying a backup step that found the database busy (default 0.25s)
+BACKUP_RETRY_SLEEP = 0.005
+
+
+def _iter_dicts(cursor: sqlite3.Cursor) -> Iterator[Dict[str, Any]]:
+    """Yield a cursor's remaining rows as dicts, fetching them in batches."""
+    columns = [column[0] for column in cursor.description]
+    # Plain tuples skip building a sqlite3.Row per record that we'd discard anyway
+    cursor.row_factory = None
+    cursor.arraysize = FETCH_BATCH_SIZE
+    while rows := cursor.fetchmany():
+        for row in rows:
+            yield dict(zip(columns, row, strict=True))
 
 
 class DatabaseError(Exception):
@@ -30,174 +317,131 @@ class Database:
         """Initialize database connection."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._generation = 0
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            # IMMEDIATE makes the implicit BEGIN before a write take the write
+            # lock up front instead of upgrading a read lock mid-transaction
+            conn = sqlite3.connect(
+                self.db_path,
+                isolation_level="IMMEDIATE",
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            with self._connections_lock:
+                self._connections.append(conn)
+                self._local.generation = self._generation
+            self._local.conn = conn
+        return conn
+
     @contextmanager
     def get_connection(self):
-        """Get a database connection with automatic closing."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get the persistent per-thread database connection."""
+        conn = self._connect()
+        try:
+            yield conn
+        except Exception:
+            # Inside transaction() the outermost block decides what to roll back
+            if conn.in_transaction and not self._batch_depth():
+                conn.rollback()
+            raise
+
+    def _batch_depth(self) -> int:
+        """Nesting level of transaction() blocks on this thread."""
+        return getattr(self._local, "batch_depth", 0)
+
+    def _commit(self, conn: sqlite3.Connection):
+        """Commit unless the write is part of an enclosing transaction()."""
+        if not self._batch_depth():
+            conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes into a single commit.
+
+        Write methods called inside the block skip their own commit; the
+        outermost block commits on success and rolls back on error.
+        """
+        depth = self._batch_depth()
+        self._local.batch_depth = depth + 1
+        conn = self._connect()
         try:
             yield conn
+        except Exception:
+            if depth == 0 and conn.in_transaction:
+                conn.rollback()
+            raise
+        else:
+            if depth == 0:
+                conn.commit()
         finally:
-            conn.close()
+            self._local.batch_depth = depth
+
+    def close(self):
+        """Close the connections opened by every thread.
+
+        Threads that use the database again afterwards transparently open a
+        fresh connection.
+        """
+        with self._connections_lock:
+            for conn in self._connections:
+                # Cheap planner statistics refresh, as recommended before closing
+                with suppress(sqlite3.Error):
+                    conn.execute("PRAGMA optimize")
+                conn.close()
+            self._connections.clear()
+            self._generation += 1
+        self._local.conn = None
 
     def _init_db(self):
         """Initialize database schema."""
         try:
             with self.get_connection() as conn:
-                # Check schema version
-                cursor = conn.cursor()
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS schema_version (
-                        version INTEGER PRIMARY KEY,
-                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
+                # Up-to-date databases need nothing beyond this header read
+                current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if current_version >= SCHEMA_VERSION:
+                    return
 
-                cursor.execute("SELECT version FROM schema_version ORDER BY version DESC LIMIT 1")
-                result = cursor.fetchone()
-                current_version = result[0] if result else 0
+                if current_version == 0:
+                    current_version = self._legacy_schema_version(conn)
 
-                if current_version < SCHEMA_VERSION:
-                    self._apply_migrations(conn, current_version)
+                conn.execute("PRAGMA journal_mode=WAL")
+                self._apply_migrations(conn, current_version)
 
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to initialize database: {e}") from e
 
+    def _legacy_schema_version(self, conn: sqlite3.Connection) -> int:
+        """Read the version from the schema_version table used before user_version."""
+        table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+        ).fetchone()
+        if table is None:
+            return 0
+        return conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+
     def _apply_migrations(self, conn: sqlite3.Connection, current_version: int):
         """Apply necessary database migrations."""
+        pending = [script for version, script in _MIGRATIONS if version > current_version]
         try:
-            cursor = conn.cursor()
-
-            # Core tables
-            if current_version < 1:
-                # Packages table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS packages (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        version TEXT NOT NULL,
-                        install_path TEXT,
-                        install_date TIMESTAMP,
-                        checksum TEXT,
-                        status TEXT DEFAULT 'not_installed',
-                        created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
-                        updated_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
-                        UNIQUE(name, version)
-                    )
-                """)
-
-                # Package versions
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS versions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        package_id INTEGER NOT NULL,
-                        version TEXT NOT NULL,
-                        url TEXT NOT NULL,
-                        checksum TEXT,
-                        release_date TIMESTAMP,
-                        is_installed BOOLEAN DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY(package_id) REFERENCES packages(id) ON DELETE CASCADE
-                    )
-                """)
-
-                # Package metadata
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS metadata (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        package_id INTEGER NOT NULL,
-                        key TEXT NOT NULL,
-                        value TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY(package_id) REFERENCES packages(id) ON DELETE CASCADE,
-                        UNIQUE(package_id, key)
-                    )
-                """)
-
-                # Installation history
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS install_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        package_id INTEGER NOT NULL,
-                        version TEXT NOT NULL,
-                        action TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        error_message TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY(package_id) REFERENCES packages(id) ON DELETE CASCADE
-                    )
-                """)
-
-                # Repositories (enhanced)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS repositories (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL UNIQUE,
-                        url TEXT,
-                        path TEXT NOT NULL,
-                        branch TEXT,
-                        last_sync TIMESTAMP,
-                        active BOOLEAN DEFAULT 1,
-                        metadata TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Manifests (enhanced)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS manifests (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        repo_id INTEGER NOT NULL,
-                        category TEXT,
-                        path TEXT NOT NULL,
-                        metadata TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY(repo_id) REFERENCES repositories(id) ON DELETE CASCADE,
-                        UNIQUE(name, repo_id)
-                    )
-                """)
-
-                # Update triggers
-                cursor.execute("""
-                    CREATE TRIGGER IF NOT EXISTS update_package_timestamp 
-                    AFTER UPDATE ON packages
-                    BEGIN
-                        UPDATE packages SET updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
-                        WHERE id = NEW.id;
-                    END;
-                """)
-
-                cursor.execute("""
-                    CREATE TRIGGER IF NOT EXISTS update_metadata_timestamp
-                    AFTER UPDATE ON metadata
-                    BEGIN
-                        UPDATE metadata SET updated_at = CURRENT_TIMESTAMP 
-                        WHERE id = NEW.id;
-                    END;
-                """)
-
-                cursor.execute("""
-                    CREATE TRIGGER IF NOT EXISTS update_repository_timestamp
-                    AFTER UPDATE ON repositories
-                    BEGIN
-                        UPDATE repositories SET updated_at = CURRENT_TIMESTAMP 
-                        WHERE id = NEW.id;
-                    END;
-                """)
-
-                # Record schema version
-                cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (SCHEMA_VERSION,))
-
-                conn.commit()
-
+            # One parse of all pending DDL; the transaction stays open until
+            # user_version is bumped so the upgrade lands atomically
+            conn.executescript("BEGIN IMMEDIATE;" + "".join(pending))
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION:d}")
+            conn.commit()
         except sqlite3.Error as e:
-            conn.rollback()
+            if conn.in_transaction:
+                conn.rollback()
             logger.error(f"Migration failed: {e}")
             raise MigrationError(f"Failed to apply migrations: {e}") from e
 
@@ -214,35 +458,74 @@ class Database:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    INSERT INTO packages (name, version, install_path, checksum, status)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
+                    _SQL["add_package"],
                     (name, version, install_path, checksum, status),
                 )
-                conn.commit()
+                self._commit(conn)
                 return cursor.lastrowid
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to add package: {e}") from e
 
+    def add_packages(self, rows: List[Dict[str, Any]]) -> int:
+        """Add many packages in a single transaction.
+
+        Each row takes the same keys as the add_package arguments.
+        Returns the number of rows written.
+        """
+        params = [
+            (
+                row["name"],
+                row["version"],
+                row.get("install_path"),
+                row.get("checksum"),
+                row.get("status", "not_installed"),
+            )
+            for row in rows
+        ]
+
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(_SQL["add_package"], params)
+                self._commit(conn)
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to add packages: {e}") from e
+
+    def upsert_package(
+        self,
+        name: str,
+        version: str,
+        install_path: Optional[str] = None,
+        checksum: Optional[str] = None,
+        status: str = "not_installed",
+    ) -> int:
+        """Add a package, or update it if this name and version already exist."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    _SQL["upsert_package"],
+                    (name, version, install_path, checksum, status),
+                )
+                package_id = cursor.fetchone()[0]
+                self._commit(conn)
+                return package_id
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to upsert package: {e}") from e
+
     def update_package_status(self, package_id: int, status: str):
         """Update package installation status."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT id FROM packages WHERE id = ?", (package_id,))
-                if not cursor.fetchone():
-                    raise DatabaseError(f"Package with ID {package_id} not found")
-
                 cursor.execute(
-                    """
-                    UPDATE packages 
-                    SET status = ? 
-                    WHERE id = ?
-                    """,
+                    _SQL["update_package_status"],
                     (status, package_id),
                 )
-                conn.commit()
+                if cursor.rowcount == 0:
+                    raise DatabaseError(f"Package with ID {package_id} not found")
+                self._commit(conn)
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to update package status: {e}") from e
 
@@ -259,34 +542,56 @@ class Database:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    INSERT INTO install_history 
-                    (package_id, version, action, status, error_message)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
+                    _SQL["add_install_history"],
                     (package_id, version, action, status, error_message),
                 )
-                conn.commit()
+                self._commit(conn)
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to add install history: {e}") from e
 
-    def get_package_history(self, package_id: int) -> List[Dict[str, Any]]:
-        """Get installation history for a package."""
+    def add_install_history_entries(self, rows: List[Dict[str, Any]]) -> int:
+        """Record many installation history entries in a single transaction.
+
+        Each row takes the same keys as the add_install_history arguments.
+        Returns the number of rows written.
+        """
+        params = [
+            (
+                row["package_id"],
+                row["version"],
+                row["action"],
+                row["status"],
+                row.get("error_message"),
+            )
+            for row in rows
+        ]
+
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(_SQL["add_install_history"], params)
+                self._commit(conn)
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to add install history: {e}") from e
+
+    def iter_package_history(self, package_id: int) -> Iterator[Dict[str, Any]]:
+        """Stream installation history for a package, most recent first."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    SELECT * FROM install_history
-                    WHERE package_id = ?
-                    ORDER BY id DESC
-                    """,
+                    _SQL["package_history"],
                     (package_id,),
                 )
-                return [dict(row) for row in cursor.fetchall()]
+                yield from _iter_dicts(cursor)
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to get package history: {e}") from e
 
+    def get_package_history(self, package_id: int) -> List[Dict[str, Any]]:
+        """Get installation history for a package."""
+        return list(self.iter_package_history(package_id))
+
     def add_package_version(
         self,
         package_id: int,
@@ -296,81 +601,73 @@ class Database:
         release_date: Optional[str] = None,
         is_installed: bool = False,
     ) -> int:
-        """Add a new version for an existing package."""
+        """Add a new version for an existing package, updating it if already present."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                # Verify the package exists
-                cursor.execute("SELECT id FROM packages WHERE id = ?", (package_id,))
-                if not cursor.fetchone():
-                    raise DatabaseError(f"Package with ID {package_id} not found")
-
-                # Check if this version already exists
                 cursor.execute(
-                    """
-                    SELECT id FROM versions 
-                    WHERE package_id = ? AND version = ?
-                    """,
-                    (package_id, version),
+                    _SQL["upsert_version_returning_id"],
+                    (package_id, version, url, checksum, release_date, is_installed),
                 )
-                existing_version = cursor.fetchone()
-                if existing_version:
-                    # Update the existing version
-                    cursor.execute(
-                        """
-                        UPDATE versions 
-                        SET url = ?, checksum = ?, release_date = ?, is_installed = ?
-                        WHERE id = ?
-                        """,
-                        (url, checksum, release_date, is_installed, existing_version[0]),
-                    )
-                    version_id = existing_version[0]
-                else:
-                    # Insert a new version
-                    cursor.execute(
-                        """
-                        INSERT INTO versions 
-                        (package_id, version, url, checksum, release_date, is_installed)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                        (package_id, version, url, checksum, release_date, is_installed),
-                    )
-                    version_id = cursor.lastrowid
-
-                conn.commit()
+                version_id = cursor.fetchone()[0]
+                self._commit(conn)
                 return version_id
         except sqlite3.Error as e:
+            if isinstance(e, sqlite3.IntegrityError) and "FOREIGN KEY" in str(e):
+                raise DatabaseError(f"Package with ID {package_id} not found") from e
             raise DatabaseError(f"Failed to add package version: {e}") from e
 
-    def get_package_versions(self, package_id: int) -> List[Dict[str, Any]]:
-        """Get all versions for a package ordered by version number (latest first)."""
+    def add_package_versions(self, rows: List[Dict[str, Any]]) -> int:
+        """Add or update many package versions in a single transaction.
+
+        Each row takes the same keys as the add_package_version arguments.
+        Returns the number of rows written.
+        """
+        params = [
+            (
+                row["package_id"],
+                row["version"],
+                row["url"],
+                row.get("checksum"),
+                row.get("release_date"),
+                row.get("is_installed", False),
+            )
+            for row in rows
+        ]
+
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(_SQL["upsert_version"], params)
+                self._commit(conn)
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to add package versions: {e}") from e
+
+    def iter_package_versions(self, package_id: int) -> Iterator[Dict[str, Any]]:
+        """Stream all versions for a package, latest first."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    SELECT * FROM versions
-                    WHERE package_id = ?
-                    ORDER BY id DESC
-                    """,
+                    _SQL["package_versions"],
                     (package_id,),
                 )
-                return [dict(row) for row in cursor.fetchall()]
+                yield from _iter_dicts(cursor)
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to get package versions: {e}") from e
 
+    def get_package_versions(self, package_id: int) -> List[Dict[str, Any]]:
+        """Get all versions for a package ordered by version number (latest first)."""
+        return list(self.iter_package_versions(package_id))
+
     def get_latest_version(self, package_id: int) -> Optional[Dict[str, Any]]:
         """Get the latest version for a package based on creation date."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    SELECT * FROM versions
-                    WHERE package_id = ?
-                    ORDER BY id DESC
-                    LIMIT 1
-                    """,
+                    _SQL["latest_version"],
                     (package_id,),
                 )
                 result = cursor.fetchone()
@@ -384,12 +681,7 @@ class Database:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    SELECT * FROM versions
-                    WHERE package_id = ? AND is_installed = 1
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                    """,
+                    _SQL["installed_version"],
                     (package_id,),
                 )
                 result = cursor.fetchone()
@@ -397,46 +689,58 @@ class Database:
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to get installed version: {e}") from e
 
-    def update_version_installed_status(self, version_id: int, installed: bool = True):
-        """Update the installed status of a specific version."""
+    def get_installed_versions(self, package_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get the currently installed version for several packages in one query."""
+        installed: Dict[int, Dict[str, Any]] = {}
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                # Verify the version exists
-                cursor.execute("SELECT id FROM versions WHERE id = ?", (version_id,))
-                if not cursor.fetchone():
-                    raise DatabaseError(f"Version with ID {version_id} not found")
+                cursor.execute(_SQL["installed_versions"], (json.dumps(package_ids),))
+                for row in _iter_dicts(cursor):
+                    # Rows are newest first within each package
+                    installed.setdefault(row["package_id"], row)
+            return installed
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to get installed versions: {e}") from e
 
-                # Update the installed status
-                cursor.execute(
-                    """
-                    UPDATE versions 
-                    SET is_installed = ?
-                    WHERE id = ?
-                    """,
-                    (installed, version_id),
-                )
+    def get_update_candidates(self) -> List[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+        """Get (package, latest version, installed version) for packages whose latest isn't installed."""
+        candidates = []
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL["update_candidates"])
+                for package in _iter_dicts(cursor):
+                    installed = package.pop("installed_version")
+                    latest = {"package_id": package["id"]}
+                    for column in _LATEST_VERSION_COLUMNS:
+                        latest[column] = package.pop(f"latest_{column}")
+                    candidates.append((package, latest, installed))
+            return candidates
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to get update candidates: {e}") from e
 
-                # If marking as installed, ensure no other versions of this package are marked as installed
+    def update_version_installed_status(self, version_id: int, installed: bool = True):
+        """Update the installed status of a specific version."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
                 if installed:
+                    # Mark this version installed and clear its siblings in one statement
                     cursor.execute(
-                        """
-                        SELECT package_id FROM versions WHERE id = ?
-                        """,
-                        (version_id,),
+                        _SQL["mark_version_installed"],
+                        (version_id, version_id),
                     )
-                    package_id = cursor.fetchone()[0]
-
+                else:
                     cursor.execute(
-                        """
-                        UPDATE versions 
-                        SET is_installed = 0
-                        WHERE package_id = ? AND id != ?
-                        """,
-                        (package_id, version_id),
+                        _SQL["unmark_version_installed"],
+                        (version_id,),
                     )
 
-                conn.commit()
+                if cursor.rowcount == 0:
+                    raise DatabaseError(f"Version with ID {version_id} not found")
+
+                self._commit(conn)
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to update version installed status: {e}") from e
 
@@ -446,10 +750,7 @@ class Database:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """
-                    SELECT * FROM packages
-                    WHERE name = ?
-                    """,
+                    _SQL["package_by_name"],
                     (name,),
                 )
                 result = cursor.fetchone()
@@ -457,13 +758,38 @@ class Database:
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to get package by name: {e}") from e
 
+    def get_packages_by_names(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several packages by name in one query, keyed by name."""
+        packages: Dict[str, Dict[str, Any]] = {}
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(_SQL["packages_by_names"], (json.dumps(names),))
+                for row in _iter_dicts(cursor):
+                    # Keep the first row per name, as get_package_by_name would
+                    packages.setdefault(row["name"], row)
+            return packages
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to get packages by name: {e}") from e
+
+    def checkpoint(self):
+        """Copy the WAL into the main database file and truncate it."""
+        try:
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to checkpoint database: {e}") from e
+
     def backup_database(self, backup_path: Path):
         """Create a backup of the database."""
+        self.checkpoint()
         try:
-            with self.get_connection() as conn:
-                backup_conn = sqlite3.connect(backup_path)
-                conn.backup(backup_conn)
-                backup_conn.close()
+            with (
+                self.get_connection() as conn,
+                closing(sqlite3.connect(backup_path)) as backup_conn,
+            ):
+                # Copy in steps so the source is not locked for the whole backup
+                conn.backup(backup_conn, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_RETRY_SLEEP)
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to create database backup: {e}") from e
 
@@ -473,9 +799,35 @@ class Database:
             raise DatabaseError(f"Backup file not found: {backup_path}")
 
         try:
-            with self.get_connection() as conn:
-                backup_conn = sqlite3.connect(backup_path)
-                backup_conn.backup(conn)
-                backup_conn.close()
+            with (
+                self.get_connection() as conn,
+                closing(sqlite3.connect(backup_path)) as backup_conn,
+            ):
+                backup_conn.backup(conn, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_RETRY_SLEEP)
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to restore database: {e}") from e
+
+
+_DATABASES: Dict[Path, Database] = {}
+_DATABASES_LOCK = threading.Lock()
+
+
+def get_database(db_path: Path) -> Database:
+    """Get the shared Database for a path, creating it on first use."""
+    key = Path(db_path).resolve()
+    with _DATABASES_LOCK:
+        db = _DATABASES.get(key)
+        if db is None:
+            db = _DATABASES[key] = Database(key)
+        return db
+
+
+@atexit.register
+def _close_shared_databases():
+    """Checkpoint and close the databases handed out by get_database."""
+    with _DATABASES_LOCK:
+        for db in _DATABASES.values():
+            with suppress(DatabaseError):
+                db.checkpoint()
+            db.close()
+        _DATABASES.clear()
@@ -1,5 +1,8 @@
+import asyncio
 import hashlib
+import os
 from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
 
 import aiohttp
 from rich.progress import Progress
@@ -9,40 +12,34 @@ from .logging import get_audit_logger, get_debug_logger
 audit_log = get_audit_logger()
 debug_log = get_debug_logger()
 
+# Network reads are buffered up to this size before being written and hashed,
+# so each hop to a worker thread moves a large block.
+DOWNLOAD_CHUNK_SIZE = 262144
 
-async def download_file(url: str, dest_path: Path, progress: Progress) -> Path:
-    """Download a file with progress bar."""
+# Maximum simultaneous connections in a shared download session
+DOWNLOAD_CONNECTION_LIMIT = 16
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create an HTTP session whose connection pool can be shared across downloads."""
+    connector = aiohttp.TCPConnector(limit=DOWNLOAD_CONNECTION_LIMIT, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def download_file(
+    url: str,
+    dest_path: Path,
+    progress: Progress,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Tuple[Path, str]:
+    """Download a file with progress bar, returning its path and SHA256 digest."""
     debug_log.info(f"Starting download of {url} to {dest_path}")
 
     try:
-        session = aiohttp.ClientSession()
-        async with session:
-            response = await session.get(url)
-            total_size = int(response.headers.get("content-length", 0))
-            debug_log.debug(f"Content length: {total_size} bytes")
-
-            task_id = progress.add_task(f"Downloading {dest_path.name}", total=total_size)
-
-            bytes_downloaded = 0
-            with open(dest_path, "wb") as f:
-                chunk_iterator = await response.content.iter_chunked(8192)
-                async for chunk in chunk_iterator:
-                    f.write(chunk)
-                    bytes_downloaded += len(chunk)
-                    progress.update(task_id, advance=len(chunk))
-
-            debug_log.debug(f"Downloaded {bytes_downloaded} of {total_size} bytes")
-
-            if bytes_downloaded == total_size:
-                debug_log.info(f"Successfully downloaded {dest_path.name}")
-                audit_log.info(f"Downloaded {url} to {dest_path} ({bytes_downloaded} bytes)")
-            else:
-                debug_log.warning(
-                    f"Download size mismatch for {dest_path.name}: "
-                    f"expected {total_size}, got {bytes_downloaded}"
-                )
-
-            return dest_path
+        if session is None:
+            async with create_session() as session:
+                return await _stream_to_file(session, url, dest_path, progress)
+        return await _stream_to_file(session, url, dest_path, progress)
 
     except Exception as e:
         error_msg = f"Failed to download {url}: {str(e)}"
@@ -51,36 +48,107 @@ async def download_file(url: str, dest_path: Path, progress: Progress) -> Path:
         raise
 
 
+async def download_files(
+    downloads: List[Tuple[str, Path]], progress: Progress
+) -> List[Tuple[Path, str]]:
+    """Download several files concurrently over one pooled session."""
+    async with create_session() as session:
+        return await asyncio.gather(
+            *(download_file(url, dest_path, progress, session) for url, dest_path in downloads)
+        )
+
+
+async def _stream_to_file(
+    session: aiohttp.ClientSession, url: str, dest_path: Path, progress: Progress
+) -> Tuple[Path, str]:
+    """Stream a response body to disk, hashing it on the way."""
+    response = await session.get(url)
+    total_size = int(response.headers.get("content-length", 0))
+    debug_log.debug(f"Content length: {total_size} bytes")
+
+    task_id = progress.add_task(f"Downloading {dest_path.name}", total=total_size)
+
+    bytes_downloaded = 0
+    sha256 = hashlib.sha256()
+    buffer = bytearray()
+
+    async def flush() -> None:
+        # Disk writes run in a worker thread so they don't stall the event loop
+        await asyncio.to_thread(f.write, buffer)
+        sha256.update(buffer)
+        progress.update(task_id, advance=len(buffer))
+        buffer.clear()
+
+    f = await asyncio.to_thread(open, dest_path, "wb")
+    with f:
+        if total_size > 0:
+            await asyncio.to_thread(_preallocate, f, total_size)
+        async for chunk in response.content.iter_any():
+            buffer += chunk
+            bytes_downloaded += len(chunk)
+            if len(buffer) >= DOWNLOAD_CHUNK_SIZE:
+                await flush()
+        if buffer:
+            await flush()
+        if total_size > 0 and bytes_downloaded != total_size:
+            # Don't leave preallocated space past a short download
+            await asyncio.to_thread(f.truncate, bytes_downloaded)
+
+    if bytes_downloaded == total_size:
+        debug_log.info(f"Successfully downloaded {dest_path.name}")
+        audit_log.info(f"Downloaded {url} to {dest_path} ({bytes_downloaded} bytes)")
+    else:
+        debug_log.warning(
+            f"Download size mismatch for {dest_path.name}: "
+            f"expected {total_size}, got {bytes_downloaded}"
+        )
+
+    return dest_path, sha256.hexdigest()
+
+
+def _preallocate(f: BinaryIO, size: int) -> None:
+    """Reserve a download's full size up front and hint sequential access."""
+    fd = f.fileno()
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        # macOS has no posix_fallocate, and some filesystems reject it
+        f.truncate(size)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+
+
 def verify_checksum(file_path: Path, expected_checksum: str) -> bool:
     """Verify file's SHA256 checksum."""
     debug_log.info(f"Verifying checksum for {file_path}")
     debug_log.debug(f"Expected checksum: {expected_checksum}")
 
     try:
-        sha256 = hashlib.sha256()
         with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                sha256.update(chunk)
-
-        actual_checksum = sha256.hexdigest()
-        debug_log.debug(f"Actual checksum: {actual_checksum}")
-
-        is_valid = actual_checksum == expected_checksum
-        if is_valid:
-            debug_log.info(f"Checksum verification passed for {file_path}")
-            audit_log.info(f"Verified checksum for {file_path}")
-        else:
-            error_msg = (
-                f"Checksum verification failed for {file_path}: "
-                f"expected {expected_checksum}, got {actual_checksum}"
-            )
-            debug_log.error(error_msg)
-            audit_log.error(error_msg)
-
-        return is_valid
+            actual_checksum = hashlib.file_digest(f, "sha256").hexdigest()
+        return check_checksum(file_path, actual_checksum, expected_checksum)
 
     except Exception as e:
         error_msg = f"Failed to verify checksum for {file_path}: {str(e)}"
         debug_log.error(error_msg)
         audit_log.error(error_msg)
         raise
+
+
+def check_checksum(file_path: Path, actual_checksum: str, expected_checksum: str) -> bool:
+    """Compare an already computed SHA256 digest against the expected one."""
+    debug_log.debug(f"Actual checksum: {actual_checksum}")
+
+    is_valid = actual_checksum == expected_checksum
+    if is_valid:
+        debug_log.info(f"Checksum verification passed for {file_path}")
+        audit_log.info(f"Verified checksum for {file_path}")
+    else:
+        error_msg = (
+            f"Checksum verification failed for {file_path}: "
+            f"expected {expected_checksum}, got {actual_checksum}"
+        )
+        debug_log.error(error_msg)
+        audit_log.error(error_msg)
+
+    return is_valid
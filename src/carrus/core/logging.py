@@ -1,14 +1,52 @@
 """Logging configuration for carrus."""
 
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
 # Constants
 AUDIT_LOGGER = "carrus.audit"
 DEBUG_LOGGER = "carrus.debug"
+LOG_BUFFER_CAPACITY = 512
+
+# Real handlers run on the listener thread; loggers only enqueue records
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class _BatchedFileHandler(MemoryHandler):
+    """Buffer records and append each batch to the target file in one write.
+
+    The batch is written when it is full, when an ERROR arrives, or on close.
+    """
+
+    def __init__(self, target: logging.FileHandler):
+        super().__init__(
+            LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=target, flushOnClose=True
+        )
+
+    def flush(self) -> None:
+        """Write all buffered records with a single write and flush."""
+        with self.lock:
+            if self.target and self.buffer:
+                target = self.target
+                target.stream.write(
+                    "".join(target.format(record) + target.terminator for record in self.buffer)
+                )
+                target.stream.flush()
+                self.buffer.clear()
+
+    def close(self) -> None:
+        """Flush remaining records and close the underlying file."""
+        target = self.target
+        super().close()
+        if target:
+            target.close()
 
 
 def setup_logging(log_dir: Optional[Path] = None, debug: bool = False) -> None:
@@ -18,6 +56,11 @@ def setup_logging(log_dir: Optional[Path] = None, debug: bool = False) -> None:
         log_dir: Directory to store log files. If None, logs to stderr only.
         debug: Whether to enable debug logging.
     """
+    global _listener, _queue_handler
+
+    # Replace any previous configuration instead of stacking handlers
+    shutdown_logging()
+
     # Create formatters
     audit_formatter = logging.Formatter("%(asctime)s - %(levelname)s - [AUDIT] %(message)s")
     debug_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
@@ -30,27 +73,63 @@ def setup_logging(log_dir: Optional[Path] = None, debug: bool = False) -> None:
     debug_logger = logging.getLogger(DEBUG_LOGGER)
     debug_logger.setLevel(logging.DEBUG if debug else logging.INFO)
 
+    # Both loggers share one queue, so each handler only accepts its own logger's records
+    audit_only = logging.Filter(AUDIT_LOGGER)
+    debug_only = logging.Filter(DEBUG_LOGGER)
+
     # Console handlers
     console_handler = logging.StreamHandler(sys.stderr)
     console_handler.setFormatter(debug_formatter)
-    debug_logger.addHandler(console_handler)
+    console_handler.addFilter(debug_only)
+    handlers = [console_handler]
 
     if log_dir:
         # Create log directory
         log_dir = Path(log_dir)
         log_dir.mkdir(parents=True, exist_ok=True)
 
-        # File handlers
-        audit_file = log_dir / f"carrus_audit_{datetime.now():%Y%m%d}.log"
+        # File handlers; both files share one date stamp
+        today = f"{datetime.now():%Y%m%d}"
+        audit_file = log_dir / f"carrus_audit_{today}.log"
         audit_handler = logging.FileHandler(audit_file)
         audit_handler.setFormatter(audit_formatter)
-        audit_logger.addHandler(audit_handler)
+        buffered_audit = _BatchedFileHandler(audit_handler)
+        buffered_audit.addFilter(audit_only)
+        handlers.append(buffered_audit)
 
         if debug:
-            debug_file = log_dir / f"carrus_debug_{datetime.now():%Y%m%d}.log"
+            debug_file = log_dir / f"carrus_debug_{today}.log"
             debug_handler = logging.FileHandler(debug_file)
             debug_handler.setFormatter(debug_formatter)
-            debug_logger.addHandler(debug_handler)
+            buffered_debug = _BatchedFileHandler(debug_handler)
+            buffered_debug.addFilter(debug_only)
+            handlers.append(buffered_debug)
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    _queue_handler = QueueHandler(log_queue)
+    audit_logger.addHandler(_queue_handler)
+    debug_logger.addHandler(_queue_handler)
+
+
+@atexit.register
+def shutdown_logging() -> None:
+    """Write out queued records and close the handlers set up by setup_logging."""
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    for name in (AUDIT_LOGGER, DEBUG_LOGGER):
+        logging.getLogger(name).removeHandler(_queue_handler)
+
+    _listener = None
+    _queue_handler = None
 
 
 def get_audit_logger() -> logging.Logger:
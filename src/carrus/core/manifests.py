@@ -1,13 +1,81 @@
 # src/carrus/core/manifests.py
 
+import copy
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import yaml
 from pydantic import BaseModel
 
+from .config import get_cache_dir
 from .types import BuildConfig
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeLoader as _SafeLoader
+
+
+@lru_cache(maxsize=256)
+def _load_manifest_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a manifest file; the stat fields key the cache so edits are reparsed."""
+    snapshot = _snapshot_path(path)
+    data = _read_snapshot(snapshot, mtime_ns, size)
+    if data is None:
+        with open(path, "rb") as f:
+            data = yaml.load(f.read(), Loader=_SafeLoader)
+        _write_snapshot(snapshot, mtime_ns, size, data)
+    return data
+
+
+def _snapshot_path(path: str) -> Path:
+    """Location of the on-disk parse snapshot for a manifest file."""
+    key = hashlib.blake2b(str(Path(path).resolve()).encode(), digest_size=16).hexdigest()
+    return get_cache_dir() / "manifests" / f"{key}.json"
+
+
+def _read_snapshot(snapshot: Path, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """Return the snapshotted manifest data if it was taken from the current file."""
+    try:
+        cached = json.loads(snapshot.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if (
+        isinstance(cached, dict)
+        and cached.get("mtime_ns") == mtime_ns
+        and cached.get("size") == size
+    ):
+        return cached.get("data")
+    return None
+
+
+def _write_snapshot(snapshot: Path, mtime_ns: int, size: int, data: Dict[str, Any]) -> None:
+    """Save parsed manifest data so later processes can skip YAML parsing."""
+    try:
+        payload = json.dumps({"mtime_ns": mtime_ns, "size": size, "data": data})
+    except (TypeError, ValueError):
+        # Values JSON can't hold (e.g. YAML dates); parse the YAML again next time
+        return
+
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=snapshot.parent, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, snapshot)
+    except OSError:
+        with suppress(OSError):
+            os.unlink(tmp_path)
+
 
 class CodeSignRequirements(BaseModel):
     """Code signing requirements for a package."""
@@ -62,9 +130,14 @@ class Manifest(BaseModel):
     @classmethod
     def from_yaml(cls, path: Path) -> "Manifest":
         """Load a manifest from a YAML file."""
-        with open(path) as f:
-            data = yaml.safe_load(f)
-            return cls(**data)
+        st = Path(path).stat()
+        data = _load_manifest_cached(str(path), st.st_mtime_ns, st.st_size)
+        return cls.model_validate(copy.deepcopy(data))
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget previously parsed manifest files."""
+        _load_manifest_cached.cache_clear()
 
     def get_build_config(self) -> Optional[BuildConfig]:
         """Get build configuration from manifest."""
@@ -77,8 +150,11 @@ class Manifest(BaseModel):
             preserve_temp=self.build.preserve_temp,
             sign=self.build.sign,
             customize=self.build.customize,
+            app_name=f"{self.name}.app",
+            version=self.version,
+            team_id=self.code_sign.team_id if self.code_sign else None,
         )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert manifest to a dictionary."""
-        return self.dict(exclude_none=True)
+        return self.model_dump(exclude_none=True, mode="json")
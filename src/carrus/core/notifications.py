@@ -3,23 +3,44 @@
 import asyncio
 import datetime
 import logging
+import os
 import re
+import shutil
 import subprocess
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from email.message import EmailMessage
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-import aiohttp
-from rich.console import Console
+from rich.console import Console, Group
+from rich.text import Text
 
 from carrus.core.config import Config
-from carrus.core.database import Database
-from carrus.core.updater import VersionTracker
+from carrus.core.database import get_database
+from carrus.core.updater import UpdateChecker, VersionTracker
+
+if TYPE_CHECKING:
+    import aiohttp
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is an optional speedup
+    from json import loads as _json_loads
 
 logger = logging.getLogger(__name__)
 
+GITHUB_ISSUE_TITLE_PREFIX = "Update Available: "
+GITHUB_ISSUES_PER_PAGE = 100
+
+# "owner/repo" or a github.com URL, and the owner/repo tail of a git remote URL
+_REPO_RE = re.compile(r"(?:https?://github\.com/)?([^/]+)/([^/]+)")
+_GIT_URL_RE = re.compile(r"[:/]([^/]+)/([^/]+?)(?:\.git)?$")
+
+# Absolute path to git, resolved once; None when git isn't installed
+_GIT = shutil.which("git")
+
 
 @dataclass
 class Notification:
@@ -30,7 +51,7 @@ class Notification:
     package_name: str
     current_version: str
     new_version: str
-    timestamp: datetime.datetime = datetime.datetime.now()
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
 
 
 class NotificationProvider(ABC):
@@ -41,6 +62,30 @@ class NotificationProvider(ABC):
         """Send a notification."""
         pass
 
+    async def prepare(self, notifications: List[Notification]) -> None:  # noqa: B027
+        """Called once before a batch of notifications is sent; optional hook."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release resources such as HTTP sessions; optional hook."""
+
+
+@lru_cache(maxsize=1)
+def _origin_remote_url(cwd: str) -> Optional[str]:
+    """Get the origin remote URL of the git checkout at cwd, if any."""
+    if _GIT is None:
+        return None
+    try:
+        result = subprocess.run(
+            [_GIT, "remote", "get-url", "origin"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=cwd,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip()
+
 
 class CLINotificationProvider(NotificationProvider):
     """CLI-based notification provider."""
@@ -51,12 +96,17 @@ class CLINotificationProvider(NotificationProvider):
     async def notify(self, notification: Notification) -> bool:
         """Display notification in CLI."""
         try:
-            self.console.print(f"\n[bold yellow]{notification.title}[/bold yellow]")
-            self.console.print(f"{notification.message}")
+            # Render all lines as one group so the console writes once
             self.console.print(
-                f"Package: [cyan]{notification.package_name}[/cyan] "
-                f"([green]{notification.current_version}[/green] → "
-                f"[yellow]{notification.new_version}[/yellow])"
+                Group(
+                    Text.from_markup(f"\n[bold yellow]{notification.title}[/bold yellow]"),
+                    Text.from_markup(notification.message),
+                    Text.from_markup(
+                        f"Package: [cyan]{notification.package_name}[/cyan] "
+                        f"([green]{notification.current_version}[/green] → "
+                        f"[yellow]{notification.new_version}[/yellow])"
+                    ),
+                )
             )
             return True
         except Exception as e:
@@ -67,31 +117,73 @@ class CLINotificationProvider(NotificationProvider):
 class SystemNotificationProvider(NotificationProvider):
     """System notification provider using platform-specific methods."""
 
-    async def notify(self, notification: Notification) -> bool:
-        """Send a system notification."""
-        try:
+    def __init__(self):
+        # One interactive osascript session serves every notification
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._proc_lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _get_proc(self) -> asyncio.subprocess.Process:
+        """Return the running osascript session, starting a new one if needed."""
+        if self._proc is None or self._proc.returncode is not None:
             # On macOS, use osascript
-            cmd = [
+            self._proc = await asyncio.create_subprocess_exec(
                 "osascript",
-                "-e",
-                f'display notification "{notification.message}" with title "{notification.title}"',
-            ]
-
-            proc = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                "-i",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
             )
+        return self._proc
 
-            _, stderr = await proc.communicate()
-
-            if proc.returncode != 0:
-                logger.error(f"System notification failed: {stderr.decode()}")
-                return False
+    async def notify(self, notification: Notification) -> bool:
+        """Send a system notification."""
+        script = (
+            f"display notification {_applescript_string(notification.message)} "
+            f"with title {_applescript_string(notification.title)}\n"
+        ).encode()
+
+        # Providers outlive event loops; a session from an earlier loop can't be reused
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._proc = None
+            self._proc_lock = asyncio.Lock()
 
-            return True
+        try:
+            async with self._proc_lock:
+                for attempt in range(2):
+                    proc = await self._get_proc()
+                    try:
+                        proc.stdin.write(script)
+                        await proc.stdin.drain()
+                        return True
+                    except (BrokenPipeError, ConnectionResetError):
+                        # The session exited; start a fresh one and retry once
+                        self._proc = None
+                        if attempt:
+                            raise
         except Exception as e:
             logger.error(f"Failed to send system notification: {e}")
             return False
 
+    async def close(self) -> None:
+        """End the osascript session."""
+        if (
+            self._proc is not None
+            and self._proc.returncode is None
+            and self._loop is asyncio.get_running_loop()
+        ):
+            self._proc.stdin.close()
+            await self._proc.wait()
+        self._proc = None
+
+
+def _applescript_string(value: str) -> str:
+    """Quote a value as a single-line AppleScript string literal."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return '"' + escaped.replace("\r", "\\r").replace("\n", "\\n") + '"'
+
 
 class EmailNotificationProvider(NotificationProvider):
     """Email notification provider."""
@@ -146,30 +238,39 @@ class GitHubNotificationProvider(NotificationProvider):
         self.token = token
         self.repo = repo
         self.label = label
+        # Open issue numbers keyed by package name, loaded once per batch
+        self._issues: Optional[Dict[str, int]] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @cached_property
+    def _repo_parts(self) -> Tuple[str, str]:
+        """Owner and repository name, parsed on first use."""
+        match = _REPO_RE.match(self.repo)
+        if match:
+            return match.groups()
 
-        # Extract owner and repo name
-        match = re.match(r"(?:https?://github\.com/)?([^/]+)/([^/]+)", repo)
+        # Try to extract from git remote
+        url = _origin_remote_url(os.getcwd())
+        match = _GIT_URL_RE.search(url) if url else None
         if match:
-            self.owner, self.repo_name = match.groups()
-        else:
-            # Try to extract from git remote
-            try:
-                # Use full path to git command for security
-                git_path = "/usr/bin/git"
-                result = subprocess.run(
-                    [git_path, "remote", "get-url", "origin"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                url = result.stdout.strip()
-                match = re.search(r"[:/]([^/]+)/([^/]+?)(?:\.git)?$", url)
-                if match:
-                    self.owner, self.repo_name = match.groups()
-                else:
-                    raise ValueError(f"Could not parse GitHub repo from: {repo}")
-            except subprocess.SubprocessError as err:
-                raise ValueError(f"Could not parse GitHub repo from: {repo}") from err
+            return match.groups()
+        raise ValueError(f"Could not parse GitHub repo from: {self.repo}")
+
+    @property
+    def owner(self) -> str:
+        """Repository owner."""
+        return self._repo_parts[0]
+
+    @property
+    def repo_name(self) -> str:
+        """Repository name."""
+        return self._repo_parts[1]
+
+    @cached_property
+    def _issues_url(self) -> str:
+        """Issues endpoint of the target repository."""
+        return f"https://api.github.com/repos/{self.owner}/{self.repo_name}/issues"
 
     async def notify(self, notification: Notification) -> bool:
         """Create or update a GitHub issue for this notification."""
@@ -178,7 +279,9 @@ class GitHubNotificationProvider(NotificationProvider):
             return False
 
         # Check if there's already an issue for this package
-        issue_number = await self._find_existing_issue(notification.package_name)
+        if self._issues is None:
+            self._issues = await self._prefetch_issues()
+        issue_number = self._issues.get(notification.package_name)
 
         if issue_number:
             # Update existing issue
@@ -187,48 +290,82 @@ class GitHubNotificationProvider(NotificationProvider):
             # Create new issue
             return await self._create_issue(notification)
 
-    async def _find_existing_issue(self, package_name: str) -> Optional[int]:
-        """Find an existing issue for this package."""
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the provider's API session, creating it on first use."""
+        import aiohttp
+
+        # Providers outlive event loops; a session from an earlier loop can't be reused
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session_loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=30, ttl_dns_cache=300),
+                headers={
+                    "Accept": "application/vnd.github.v3+json",
+                    "Authorization": f"token {self.token}",
+                },
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the API session and forget the loaded issue map."""
+        if self._session is not None and self._session_loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        # Issues may be closed on GitHub between runs; reload them next time
+        self._issues = None
+
+    async def prepare(self, notifications: List[Notification]) -> None:
+        """Load the open update issues once for the whole batch."""
+        self._issues = await self._prefetch_issues()
+
+    async def _prefetch_issues(self) -> Dict[str, int]:
+        """Map package names to their open update issue numbers."""
+        issues: Dict[str, int] = {}
         try:
-            url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}/issues"
-            headers = {
-                "Accept": "application/vnd.github.v3+json",
-                "Authorization": f"token {self.token}",
-            }
-            params = {
-                "state": "open",
-                "labels": self.label,
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params) as response:
+            url = self._issues_url
+
+            session = await self._get_session()
+            page = 1
+            while True:
+                params = {
+                    "state": "open",
+                    "labels": self.label,
+                    "per_page": GITHUB_ISSUES_PER_PAGE,
+                    "page": page,
+                }
+                async with session.get(url, params=params) as response:
                     if response.status != 200:
                         logger.error(f"Failed to get GitHub issues: {response.status}")
-                        return None
+                        return issues
 
-                    issues = await response.json()
+                    batch = await response.json(loads=_json_loads)
 
-                    # Look for issue with package name in title
-                    for issue in issues:
-                        if package_name in issue["title"]:
-                            return issue["number"]
+                for issue in batch:
+                    title = issue["title"]
+                    if "pull_request" in issue or not title.startswith(GITHUB_ISSUE_TITLE_PREFIX):
+                        continue
+                    # Titles are "<prefix><package name> <version>"
+                    package_name = title.removeprefix(GITHUB_ISSUE_TITLE_PREFIX).rsplit(" ", 1)[0]
+                    # Issues come newest first; keep the most recent per package
+                    issues.setdefault(package_name, issue["number"])
 
-                    return None
+                if len(batch) < GITHUB_ISSUES_PER_PAGE:
+                    return issues
+                page += 1
 
         except Exception as e:
-            logger.error(f"Failed to find GitHub issue: {e}")
-            return None
+            logger.error(f"Failed to find GitHub issues: {e}")
+            return issues
 
     async def _create_issue(self, notification: Notification) -> bool:
         """Create a new GitHub issue for this notification."""
         try:
-            url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}/issues"
-            headers = {
-                "Accept": "application/vnd.github.v3+json",
-                "Authorization": f"token {self.token}",
-            }
+            url = self._issues_url
 
-            title = f"Update Available: {notification.package_name} {notification.new_version}"
+            title = (
+                f"{GITHUB_ISSUE_TITLE_PREFIX}{notification.package_name} {notification.new_version}"
+            )
             body = f"""
 ## Update Available
 
@@ -247,14 +384,19 @@ class GitHubNotificationProvider(NotificationProvider):
                 "labels": [self.label],
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=data) as response:
-                    if response.status not in (201, 200):
-                        logger.error(f"Failed to create GitHub issue: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                if response.status not in (201, 200):
+                    logger.error(f"Failed to create GitHub issue: {response.status}")
+                    return False
 
-                    logger.info(f"Created GitHub issue for {notification.package_name}")
-                    return True
+                # Later notifications in this batch comment on the new issue
+                if self._issues is not None:
+                    created = await response.json(loads=_json_loads)
+                    self._issues[notification.package_name] = created["number"]
+
+                logger.info(f"Created GitHub issue for {notification.package_name}")
+                return True
 
         except Exception as e:
             logger.error(f"Failed to create GitHub issue: {e}")
@@ -263,11 +405,7 @@ class GitHubNotificationProvider(NotificationProvider):
     async def _update_issue(self, issue_number: int, notification: Notification) -> bool:
         """Update an existing GitHub issue for this notification."""
         try:
-            url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}/issues/{issue_number}/comments"
-            headers = {
-                "Accept": "application/vnd.github.v3+json",
-                "Authorization": f"token {self.token}",
-            }
+            url = f"{self._issues_url}/{issue_number}/comments"
 
             comment = f"""
 ## Update Available
@@ -285,14 +423,14 @@ class GitHubNotificationProvider(NotificationProvider):
                 "body": comment,
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=data) as response:
-                    if response.status not in (201, 200):
-                        logger.error(f"Failed to update GitHub issue: {response.status}")
-                        return False
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                if response.status not in (201, 200):
+                    logger.error(f"Failed to update GitHub issue: {response.status}")
+                    return False
 
-                    logger.info(f"Updated GitHub issue for {notification.package_name}")
-                    return True
+                logger.info(f"Updated GitHub issue for {notification.package_name}")
+                return True
 
         except Exception as e:
             logger.error(f"Failed to update GitHub issue: {e}")
@@ -355,6 +493,8 @@ class SlackNotificationProvider(NotificationProvider):
                 payload["channel"] = self.channel
 
             # Send the webhook request
+            import aiohttp
+
             async with aiohttp.ClientSession() as session:
                 async with session.post(
                     self.webhook_url, json=payload, headers={"Content-Type": "application/json"}
@@ -374,6 +514,35 @@ class SlackNotificationProvider(NotificationProvider):
             return False
 
 
+def _make_provider(
+    method: str,
+    email: Optional[str] = None,
+    github_token: Optional[str] = None,
+    github_repo: Optional[str] = None,
+    github_label: str = "update-available",
+    slack_webhook_url: Optional[str] = None,
+    slack_channel: Optional[str] = None,
+    slack_username: str = "Carrus Update Bot",
+) -> NotificationProvider:
+    """Build the provider for a notification method.
+
+    Providers hold per-service state (API session, open issue map, token), so
+    each call returns a fresh instance; the costly git remote lookup is
+    cached separately by _origin_remote_url.
+    """
+    if method == "system":
+        return SystemNotificationProvider()
+    if method == "email" and email:
+        return EmailNotificationProvider(email)
+    if method == "github" and github_token and github_repo:
+        return GitHubNotificationProvider(token=github_token, repo=github_repo, label=github_label)
+    if method == "slack" and slack_webhook_url:
+        return SlackNotificationProvider(
+            webhook_url=slack_webhook_url, channel=slack_channel, username=slack_username
+        )
+    return CLINotificationProvider()
+
+
 class NotificationService:
     """Service for managing notifications."""
 
@@ -381,35 +550,25 @@ class NotificationService:
         """Initialize the notification service."""
         self.config = config
         self.notification_config = config.notifications
-        self.db = Database(Path(db_path or config.db_path))
+        self.db = get_database(Path(db_path or config.db_path))
         self.version_tracker = VersionTracker(self.db)
 
         # Set up the notification provider based on configuration
-        if self.notification_config.method == "system":
-            self.provider = SystemNotificationProvider()
-        elif self.notification_config.method == "email" and self.notification_config.email:
-            self.provider = EmailNotificationProvider(self.notification_config.email)
-        elif (
-            self.notification_config.method == "github"
-            and self.notification_config.github_token
-            and self.notification_config.github_repo
-        ):
-            self.provider = GitHubNotificationProvider(
-                token=self.notification_config.github_token,
-                repo=self.notification_config.github_repo,
-                label=self.notification_config.github_issue_label,
-            )
-        elif (
-            self.notification_config.method == "slack"
-            and self.notification_config.slack_webhook_url
-        ):
-            self.provider = SlackNotificationProvider(
-                webhook_url=self.notification_config.slack_webhook_url,
-                channel=self.notification_config.slack_channel,
-                username=self.notification_config.slack_username,
-            )
-        else:
-            self.provider = CLINotificationProvider()
+        self.provider = self._provider_from_config()
+
+    def _provider_from_config(self) -> NotificationProvider:
+        """Get the provider matching the current notification settings."""
+        nc = self.notification_config
+        return _make_provider(
+            nc.method,
+            email=nc.email,
+            github_token=nc.github_token,
+            github_repo=nc.github_repo,
+            github_label=nc.github_issue_label,
+            slack_webhook_url=nc.slack_webhook_url,
+            slack_channel=nc.slack_channel,
+            slack_username=nc.slack_username,
+        )
 
     async def check_updates(self) -> List[Notification]:
         """Check for updates and return notifications for available updates."""
@@ -418,18 +577,12 @@ class NotificationService:
         # Get all available updates
         available_updates = self.version_tracker.get_available_updates()
 
-        for package, latest_version in available_updates:
-            # Get installed version
-            installed_version = self.db.get_installed_version(package["id"])
-
-            if not installed_version:
-                continue
-
+        for package, latest_version, installed_version in available_updates:
             notification = Notification(
                 title="Update Available",
                 message=f"A new version of {package['name']} is available.",
                 package_name=package["name"],
-                current_version=installed_version["version"],
+                current_version=installed_version,
                 new_version=latest_version["version"],
             )
 
@@ -447,15 +600,32 @@ class NotificationService:
             return 0
 
         notifications = await self.check_updates()
+        if notifications:
+            await self.provider.prepare(notifications)
+
+        # Send notifications concurrently, bounded to respect provider rate limits
+        semaphore = asyncio.Semaphore(self.notification_config.max_concurrency or 8)
+
+        async def send(notification: Notification) -> bool:
+            async with semaphore:
+                return await self.provider.notify(notification)
+
+        results = await asyncio.gather(*map(send, notifications), return_exceptions=True)
 
-        # Send notifications
         sent_count = 0
-        for notification in notifications:
-            if await self.provider.notify(notification):
+        for notification, result in zip(notifications, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to notify about {notification.package_name}: {result}")
+            elif result:
                 sent_count += 1
 
         return sent_count
 
+    async def close(self) -> None:
+        """Release resources held by the notification provider and update checkers."""
+        await self.provider.close()
+        await UpdateChecker.aclose()
+
     def should_check_updates(self) -> bool:
         """Determine if updates should be checked based on last check time."""
         if not self.notification_config.enabled:
@@ -493,7 +663,6 @@ class NotificationService:
             if not email:
                 raise ValueError("Email address required for email notifications")
             self.notification_config.email = email
-            self.provider = EmailNotificationProvider(email)
         elif method == "github":
             if not github_token:
                 raise ValueError("GitHub token required for GitHub notifications")
@@ -504,12 +673,6 @@ class NotificationService:
             self.notification_config.github_repo = github_repo
             if github_label:
                 self.notification_config.github_issue_label = github_label
-
-            self.provider = GitHubNotificationProvider(
-                token=github_token,
-                repo=github_repo,
-                label=github_label or self.notification_config.github_issue_label,
-            )
         elif method == "slack":
             if not slack_webhook_url:
                 raise ValueError("Slack webhook URL required for Slack notifications")
@@ -520,12 +683,4 @@ class NotificationService:
             if slack_username:
                 self.notification_config.slack_username = slack_username
 
-            self.provider = SlackNotificationProvider(
-                webhook_url=slack_webhook_url,
-                channel=slack_channel,
-                username=slack_username or self.notification_config.slack_username,
-            )
-        elif method == "system":
-            self.provider = SystemNotificationProvider()
-        else:
-            self.provider = CLINotificationProvider()
+        self.provider = self._provider_from_config()
@@ -1,14 +1,130 @@
 # src/carrus/core/repository.py
 
 import json
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Iterator, List, Optional, Tuple
 
 import yaml
 from rich.table import Table
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeLoader as _SafeLoader
+
+# Per-connection settings; journal_mode=WAL is persisted in the file by _init_db
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Rows pulled from SQLite per fetchmany call when listing manifests
+FETCH_BATCH_SIZE = 512
+
+# Manifest fields stored as columns so listings don't parse each manifest
+_MANIFEST_COLUMNS = ("description", "display_name", "version")
+
+# Full-text index over manifests. The trigram tokenizer keeps the substring
+# semantics of the old LIKE search, for terms of at least three characters.
+_FTS_MIN_TERM = 3
+_CREATE_FTS = """
+    CREATE VIRTUAL TABLE manifests_fts USING fts5(
+        name, description, content='manifests', content_rowid='rowid', tokenize='trigram'
+    )
+"""
+_REBUILD_FTS = "INSERT INTO manifests_fts(manifests_fts) VALUES ('rebuild')"
+
+_UPSERT_REPOSITORY = """
+    INSERT OR REPLACE INTO repositories (name, path, url, metadata) VALUES (?, ?, ?, ?)
+"""
+_UPSERT_MANIFEST = """
+    INSERT OR REPLACE INTO manifests
+        (name, repo_name, category, path, description, display_name, version)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Listing/search query for each (category filter, term filter) combination.
+# Built once so every call hands sqlite3 identical text for its statement cache.
+_SELECT_MANIFESTS = """
+    SELECT
+        manifests.name,
+        manifests.category,
+        repositories.name as repo_name,
+        manifests.description
+    FROM manifests
+    JOIN repositories ON manifests.repo_name = repositories.name
+    WHERE repositories.active = 1
+"""
+_TERM_FILTERS = {
+    "all": "",
+    "match": " AND manifests.rowid IN"
+    " (SELECT rowid FROM manifests_fts WHERE manifests_fts MATCH ?)",
+    "like": " AND (manifests.name LIKE ? OR manifests.description LIKE ?)",
+}
+_MANIFEST_QUERIES = {
+    (by_category, kind): _SELECT_MANIFESTS
+    + (" AND manifests.category = ?" if by_category else "")
+    + term_filter
+    + " ORDER BY manifests.category, manifests.name"
+    for by_category in (False, True)
+    for kind, term_filter in _TERM_FILTERS.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file; keyed on mtime and size so edits are picked up.
+
+    Callers share the returned object and must not modify it.
+    """
+    with open(path) as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+def _load_yaml(path: str) -> Any:
+    """Parse a YAML file, reusing the previous result while it is unchanged."""
+    st = os.stat(path)
+    return _load_yaml_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def _manifest_fields(manifest_path: str) -> Tuple[Optional[str], ...]:
+    """Values for _MANIFEST_COLUMNS read from a manifest file."""
+    try:
+        data = _load_yaml(manifest_path)
+    except (OSError, yaml.YAMLError):
+        data = None
+    if not isinstance(data, dict):
+        data = {}
+    return (data.get("description"), data.get("name"), data.get("version"))
+
+
+def _iter_manifests(manifests_dir: Path) -> Iterator[Tuple[str, str, str]]:
+    """Yield (name, category, path) for every manifest below manifests_dir.
+
+    The category is the manifest's directory relative to the root. Walks
+    with os.scandir so file types come from the directory listing.
+    """
+    stack = [(str(manifests_dir), "")]
+    while stack:
+        directory, relative = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(
+                        (entry.path, f"{relative}/{entry.name}" if relative else entry.name)
+                    )
+                elif entry.name.endswith(".yaml") and entry.name != "repo.yaml" and entry.is_file():
+                    category = relative or "uncategorized"
+                    yield entry.name[: -len(".yaml")], category, entry.path
+
 
 @dataclass
 class RepoMetadata:
@@ -27,11 +143,43 @@ class RepositoryManager:
     def __init__(self, base_path: Path):
         self.base_path = Path(base_path)
         self.db_path = self.base_path / "repos.db"
+        # One connection per manager, shared across threads under _lock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._fts = False
         self._init_db()
 
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return the manager's connection, opening and tuning it on first use."""
+        if self._conn is None:
+            # Writes take the lock at BEGIN rather than upgrading mid-transaction
+            conn = sqlite3.connect(
+                self.db_path, timeout=5.0, isolation_level="IMMEDIATE", check_same_thread=False
+            )
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
+        return self._conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Use the shared connection exclusively, committing on success."""
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                yield conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def _init_db(self):
         """Initialize the repository database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS repositories (
                     name TEXT PRIMARY KEY,
@@ -48,9 +196,43 @@ class RepositoryManager:
                     category TEXT,
                     path TEXT,
                     metadata TEXT,
+                    description TEXT,
+                    display_name TEXT,
+                    version TEXT,
                     UNIQUE(name, repo_name)
                 )
             """)
+            # Catalogs created before the typed columns existed
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(manifests)")}
+            for column in _MANIFEST_COLUMNS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE manifests ADD COLUMN {column} TEXT")
+            # Listings are ordered by category then name; the index returns rows in
+            # that order so SQLite doesn't sort, and serves the category filter
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_manifests_category_name "
+                "ON manifests(category, name)"
+            )
+            self._fts = self._init_fts(conn)
+
+    @staticmethod
+    def _init_fts(conn: sqlite3.Connection) -> bool:
+        """Create the manifest search index if needed; False if FTS5 is unavailable."""
+        existing = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'manifests_fts'"
+        ).fetchone()
+        if existing and "description" in existing[0]:
+            return True
+        if existing:
+            # Earlier index over the metadata column
+            conn.execute("DROP TABLE manifests_fts")
+        try:
+            conn.execute(_CREATE_FTS)
+        except sqlite3.OperationalError:  # SQLite built without FTS5 or trigram
+            return False
+        # Index manifests that were added before the search table existed
+        conn.execute(_REBUILD_FTS)
+        return True
 
     def add_repository(self, path: Path, name: Optional[str] = None) -> RepoMetadata:
         """Add a repository to the system."""
@@ -64,44 +246,50 @@ class RepositoryManager:
         if not repo_yaml.exists():
             raise ValueError(f"No repo.yaml found in {path}")
 
-        with open(repo_yaml) as f:
-            repo_data = yaml.safe_load(f)
-            metadata = RepoMetadata(
-                name=name or repo_data.get("name"),
-                description=repo_data.get("description", ""),
-                maintainer=repo_data.get("maintainer", ""),
-                url=repo_data.get("url"),
-                branch=repo_data.get("branch"),
-            )
+        repo_data = _load_yaml(str(repo_yaml))
+        metadata = RepoMetadata(
+            name=name or repo_data.get("name"),
+            description=repo_data.get("description", ""),
+            maintainer=repo_data.get("maintainer", ""),
+            url=repo_data.get("url"),
+            branch=repo_data.get("branch"),
+        )
 
         # Check for manifests directory
         manifests_dir = path / "manifests"
         if not manifests_dir.exists():
             raise ValueError(f"No manifests directory found in {path}")
 
-        # Store in database
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO repositories (name, path, url, metadata) VALUES (?, ?, ?, ?)",
-                (metadata.name, str(path), metadata.url, json.dumps(repo_data)),
-            )
-
-            # Index manifests
-            for manifest_path in manifests_dir.rglob("*.yaml"):
-                if manifest_path.name == "repo.yaml":
-                    continue
+        # Read every manifest before taking the write lock
+        repo_row = (metadata.name, str(path), metadata.url, json.dumps(repo_data))
+        manifest_rows = [
+            (name, metadata.name, category, manifest_path, *_manifest_fields(manifest_path))
+            for name, category, manifest_path in _iter_manifests(manifests_dir)
+        ]
 
-                category = manifest_path.parent.relative_to(manifests_dir).as_posix()
-                if category == ".":
-                    category = "uncategorized"
-
-                conn.execute(
-                    "INSERT OR REPLACE INTO manifests (name, repo_name, category, path) VALUES (?, ?, ?, ?)",
-                    (manifest_path.stem, metadata.name, category, str(manifest_path)),
-                )
+        # Store in database as one transaction
+        with self._connect() as conn:
+            conn.execute(_UPSERT_REPOSITORY, repo_row)
+            conn.executemany(_UPSERT_MANIFEST, manifest_rows)
+            # INSERT OR REPLACE gives replaced rows new rowids, so reindex in bulk
+            if self._fts:
+                conn.execute(_REBUILD_FTS)
 
         return metadata
 
+    def _manifest_query(self, term: str, category: Optional[str]) -> Tuple[str, List[str]]:
+        """Pick the prepared listing query for these filters and build its parameters."""
+        params = [category] if category else []
+        if term and self._fts and len(term) >= _FTS_MIN_TERM:
+            kind = "match"
+            params.append('{name description} : "%s"' % term.replace('"', '""'))
+        elif term:
+            kind = "like"
+            params.extend([f"%{term}%", f"%{term}%"])
+        else:
+            kind = "all"
+        return _MANIFEST_QUERIES[bool(category), kind], params
+
     def list_manifests(self, category: Optional[str] = None) -> Table:
         """List all manifests in a rich table."""
         table = Table(title="Available Packages")
@@ -110,67 +298,28 @@ class RepositoryManager:
         table.add_column("Repository", style="yellow")
         table.add_column("Description", style="white")
 
-        with sqlite3.connect(self.db_path) as conn:
-            query = """
-                SELECT
-                    manifests.name,
-                    manifests.category,
-                    repositories.name as repo_name,
-                    manifests.metadata
-                FROM manifests
-                JOIN repositories ON manifests.repo_name = repositories.name
-                WHERE repositories.active = 1
-            """
-
-            if category:
-                query += " AND manifests.category = ?"
-                params = (category,)
-            else:
-                params = ()
-
-            query += " ORDER BY manifests.category, manifests.name"
-
-            for row in conn.execute(query, params):
-                metadata = json.loads(row[3] or "{}")
-                table.add_row(row[0], row[1], row[2], metadata.get("description", ""))
+        with self._connect() as conn:
+            cursor = conn.execute(*self._manifest_query("", category))
+            while rows := cursor.fetchmany(FETCH_BATCH_SIZE):
+                for name, manifest_category, repo_name, description in rows:
+                    table.add_row(name, manifest_category, repo_name, description or "")
 
         return table
 
     def search_manifests(self, term: str, category: Optional[str] = None) -> List[dict]:
         """Search for manifests."""
         results = []
-        with sqlite3.connect(self.db_path) as conn:
-            query = """
-                SELECT
-                    manifests.name,
-                    manifests.category,
-                    repositories.name as repo_name,
-                    manifests.metadata
-                FROM manifests
-                JOIN repositories ON manifests.repo_name = repositories.name
-                WHERE repositories.active = 1
-            """
-
-            params = []
-            if category:
-                query += " AND manifests.category = ?"
-                params.append(category)
-
-            if term:
-                query += " AND (manifests.name LIKE ? OR manifests.metadata LIKE ?)"
-                params.extend([f"%{term}%", f"%{term}%"])
-
-            query += " ORDER BY manifests.category, manifests.name"
-
-            for row in conn.execute(query, params):
-                metadata = json.loads(row[3] or "{}")
-                results.append(
+        with self._connect() as conn:
+            cursor = conn.execute(*self._manifest_query(term, category))
+            while rows := cursor.fetchmany(FETCH_BATCH_SIZE):
+                results.extend(
                     {
-                        "name": row[0],
-                        "category": row[1],
-                        "repo_name": row[2],
-                        "description": metadata.get("description", ""),
+                        "name": name,
+                        "category": manifest_category,
+                        "repo_name": repo_name,
+                        "description": description or "",
                     }
+                    for name, manifest_category, repo_name, description in rows
                 )
 
         return results
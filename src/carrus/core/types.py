@@ -1,6 +1,7 @@
 # src/carrus/core/types.py
 
 import shutil
+import stat
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -40,6 +41,9 @@ class BuildConfig:
     preserve_temp: bool = False
     sign: Optional[Dict[str, str]] = None
     customize: Optional[List[Dict[str, Any]]] = None
+    app_name: Optional[str] = None  # Expected bundle name, e.g. "Firefox.app"
+    version: Optional[str] = None  # Expected CFBundleShortVersionString
+    team_id: Optional[str] = None  # Expected code signing Team ID
 
 
 @dataclass
@@ -72,10 +76,14 @@ class BuildState:
         cleanup_errors = []
         for path in self.temp_files:
             try:
-                if path.is_file():
-                    path.unlink()
-                elif path.is_dir():
+                # One lstat per path; symlinks are removed, never followed
+                mode = path.lstat().st_mode
+                if stat.S_ISDIR(mode):
                     shutil.rmtree(path)
+                else:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
             except Exception as e:
                 cleanup_errors.append(f"Failed to clean up {path}: {e}")
         return cleanup_errors
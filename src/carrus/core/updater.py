@@ -3,18 +3,35 @@
 import asyncio
 import json
 import logging
+import time
+import zipfile
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import aiohttp
 from packaging import version
 
 from carrus.core.database import Database
 
+if TYPE_CHECKING:
+    import aiohttp
+
 logger = logging.getLogger(__name__)
 
+# Latest Firefox release as (monotonic fetch time, version), shared by all checkers
+FIREFOX_VERSIONS_URL = "https://product-details.mozilla.org/1.0/firefox_versions.json"
+FIREFOX_VERSIONS_TTL = 300.0
+_firefox_latest: Optional[Tuple[float, str]] = None
+_firefox_fetch: Optional["asyncio.Task[Optional[str]]"] = None
+
+
+@lru_cache(maxsize=4096)
+def _parse_version(value: str) -> version.Version:
+    """Parse a version string, memoized since the same strings recur across checks."""
+    return version.parse(value)
+
 
 @dataclass
 class UpdateInfo:
@@ -31,6 +48,34 @@ class UpdateInfo:
 class UpdateChecker:
     """Base class for update checkers."""
 
+    # HTTP session shared by every checker, tied to the loop that created it
+    _session: Optional["aiohttp.ClientSession"] = None
+    _session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    async def _get_session() -> "aiohttp.ClientSession":
+        """Return the shared checker session, creating it on first use."""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        session = UpdateChecker._session
+        if session is None or session.closed or UpdateChecker._session_loop is not loop:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+            )
+            UpdateChecker._session = session
+            UpdateChecker._session_loop = loop
+        return session
+
+    @staticmethod
+    async def aclose() -> None:
+        """Close the shared checker session."""
+        session = UpdateChecker._session
+        if session is not None and UpdateChecker._session_loop is asyncio.get_running_loop():
+            await session.close()
+        UpdateChecker._session = None
+        UpdateChecker._session_loop = None
+
     @staticmethod
     async def create_checker(recipe_type: str) -> "UpdateChecker":
         """Factory method to create appropriate checker."""
@@ -57,37 +102,73 @@ class FirefoxUpdateChecker(UpdateChecker):
     """Firefox-specific update checker."""
 
     async def check_update(self, current_version: str) -> Optional[UpdateInfo]:
+        latest = await self._latest_version()
+        if not latest:
+            return None
+
         try:
-            async with aiohttp.ClientSession() as session:
-                # Check Mozilla's update API
-                url = "https://product-details.mozilla.org/1.0/firefox_versions.json"
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to fetch Firefox versions: {response.status}")
-                        return None
-
-                    data = await response.json()
-                    latest = data.get("LATEST_FIREFOX_VERSION")
-
-                    if not latest:
-                        logger.error("No latest version found in Firefox API response")
-                        return None
-
-                    try:
-                        if version.parse(latest) > version.parse(current_version):
-                            download_url = (
-                                f"https://download-installer.cdn.mozilla.net/pub/firefox/"
-                                f"releases/{latest}/mac/en-US/Firefox%20{latest}.dmg"
-                            )
-                            return UpdateInfo(
-                                current_version=current_version,
-                                latest_version=latest,
-                                download_url=download_url,
-                                requires_rebuild=True,
-                            )
-                    except version.InvalidVersion:
-                        logger.error(f"Invalid version comparison: {current_version} vs {latest}")
-                        return None
+            if _parse_version(latest) > _parse_version(current_version):
+                download_url = (
+                    f"https://download-installer.cdn.mozilla.net/pub/firefox/"
+                    f"releases/{latest}/mac/en-US/Firefox%20{latest}.dmg"
+                )
+                return UpdateInfo(
+                    current_version=current_version,
+                    latest_version=latest,
+                    download_url=download_url,
+                    requires_rebuild=True,
+                )
+        except version.InvalidVersion:
+            logger.error(f"Invalid version comparison: {current_version} vs {latest}")
+
+        return None
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget the cached latest Firefox version."""
+        global _firefox_latest
+        _firefox_latest = None
+
+    @classmethod
+    async def _latest_version(cls) -> Optional[str]:
+        """Latest Firefox version, fetched at most once per TTL and shared by concurrent callers."""
+        global _firefox_fetch
+        if _firefox_latest and time.monotonic() - _firefox_latest[0] < FIREFOX_VERSIONS_TTL:
+            return _firefox_latest[1]
+
+        loop = asyncio.get_running_loop()
+        if _firefox_fetch is None or _firefox_fetch.get_loop() is not loop:
+            _firefox_fetch = loop.create_task(cls._fetch_latest_version())
+        task = _firefox_fetch
+        try:
+            # Shielded so one cancelled caller doesn't cancel the others' request
+            return await asyncio.shield(task)
+        finally:
+            if task.done() and _firefox_fetch is task:
+                _firefox_fetch = None
+
+    @staticmethod
+    async def _fetch_latest_version() -> Optional[str]:
+        """Ask Mozilla's product-details API for the latest Firefox version."""
+        global _firefox_latest
+        import aiohttp
+
+        try:
+            session = await UpdateChecker._get_session()
+            async with session.get(FIREFOX_VERSIONS_URL) as response:
+                if response.status != 200:
+                    logger.error(f"Failed to fetch Firefox versions: {response.status}")
+                    return None
+
+                data = await response.json()
+                latest = data.get("LATEST_FIREFOX_VERSION")
+
+                if not latest:
+                    logger.error("No latest version found in Firefox API response")
+                    return None
+
+                _firefox_latest = (time.monotonic(), latest)
+                return latest
 
         except aiohttp.ClientError as e:
             logger.error(f"Network error checking Firefox update: {e}")
@@ -106,38 +187,64 @@ class VersionTracker:
 
     async def check_for_updates(self, recipe_type: str, package_name: str) -> Optional[UpdateInfo]:
         """Check if updates are available for a specific package."""
-        # Get package from database
-        package = self.db.get_package_by_name(package_name)
-        if not package:
-            logger.warning(
-                f"Cannot check for updates: Package {package_name} not found in database"
-            )
-            return None
+        results = await self.check_for_updates_many([(recipe_type, package_name)])
+        return results[package_name]
+
+    async def check_for_updates_many(
+        self, items: List[Tuple[str, str]]
+    ) -> Dict[str, Optional[UpdateInfo]]:
+        """Check several (recipe_type, package_name) pairs concurrently.
 
-        # Get current installed version
-        current_version = package.get("version", "0.0.0")
+        Packages are looked up in one query and newly seen versions are
+        recorded in one transaction.
+        """
+        packages = self.db.get_packages_by_names([name for _, name in items])
+        results: Dict[str, Optional[UpdateInfo]] = {}
+
+        checks = []
+        for recipe_type, package_name in items:
+            package = packages.get(package_name)
+            if not package:
+                logger.warning(
+                    f"Cannot check for updates: Package {package_name} not found in database"
+                )
+                results[package_name] = None
+                continue
 
-        # Get an appropriate checker for the recipe type
-        checker = await UpdateChecker.create_checker(recipe_type)
+            # Get current installed version and an appropriate checker for the recipe type
+            current_version = package.get("version", "0.0.0")
+            checker = await UpdateChecker.create_checker(recipe_type)
+            checks.append((package_name, package, current_version, checker))
 
-        # Check for updates
-        update_info = await checker.check_update(current_version)
+        update_infos = await asyncio.gather(
+            *(checker.check_update(current_version) for _, _, current_version, checker in checks)
+        )
 
-        if update_info:
+        new_versions = []
+        for (package_name, package, current_version, _), update_info in zip(
+            checks, update_infos, strict=True
+        ):
+            results[package_name] = update_info
             # Record the new version in the database if it doesn't exist
-            if self._compare_versions(update_info.latest_version, current_version) > 0:
-                self.db.add_package_version(
-                    package_id=package["id"],
-                    version=update_info.latest_version,
-                    url=update_info.download_url,
-                    release_date=update_info.release_date.isoformat()
-                    if update_info.release_date
-                    else None,
+            if (
+                update_info
+                and self._compare_versions(update_info.latest_version, current_version) > 0
+            ):
+                new_versions.append(
+                    {
+                        "package_id": package["id"],
+                        "version": update_info.latest_version,
+                        "url": update_info.download_url,
+                        "release_date": update_info.release_date.isoformat()
+                        if update_info.release_date
+                        else None,
+                    }
                 )
 
-            return update_info
+        if new_versions:
+            self.db.add_package_versions(new_versions)
 
-        return None
+        return results
 
     def record_version(
         self,
@@ -177,38 +284,14 @@ class VersionTracker:
 
         return self.db.get_package_versions(package["id"])
 
-    def get_available_updates(self) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
-        """Get all packages with available updates."""
-        updates = []
-
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            # Get all packages
-            cursor.execute("SELECT * FROM packages")
-            packages = [dict(row) for row in cursor.fetchall()]
-
-            for package in packages:
-                # Get installed version
-                installed_version = self.db.get_installed_version(package["id"])
-
-                # If no installed version, continue
-                if not installed_version:
-                    continue
-
-                # Get latest available version
-                latest_version = self.db.get_latest_version(package["id"])
-
-                # If latest version is newer than installed, add to updates
-                if (
-                    latest_version
-                    and self._compare_versions(
-                        latest_version["version"], installed_version["version"]
-                    )
-                    > 0
-                ):
-                    updates.append((package, latest_version))
-
-        return updates
+    def get_available_updates(self) -> List[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+        """Get (package, latest version, installed version) for all packages with updates."""
+        # One query returns each package with its latest and installed versions
+        return [
+            (package, latest_version, installed_version)
+            for package, latest_version, installed_version in self.db.get_update_candidates()
+            if self._compare_versions(latest_version["version"], installed_version) > 0
+        ]
 
     def mark_version_installed(self, package_name: str, version: str) -> bool:
         """Mark a specific version as installed."""
@@ -238,19 +321,20 @@ class VersionTracker:
 
             version_id = result[0]
 
-        # Mark as installed
-        self.db.update_version_installed_status(version_id, installed=True)
+        with self.db.transaction():
+            # Mark as installed
+            self.db.update_version_installed_status(version_id, installed=True)
 
-        # Update package record
-        self.db.update_package_status(package["id"], "installed")
+            # Update package record
+            self.db.update_package_status(package["id"], "installed")
 
-        # Record in history
-        self.db.add_install_history(
-            package_id=package["id"],
-            version=version,
-            action="install",
-            status="success",
-        )
+            # Record in history
+            self.db.add_install_history(
+                package_id=package["id"],
+                version=version,
+                action="install",
+                status="success",
+            )
 
         return True
 
@@ -265,8 +349,8 @@ class VersionTracker:
             -1 if version1 < version2
         """
         try:
-            v1 = version.parse(version1)
-            v2 = version.parse(version2)
+            v1 = _parse_version(version1)
+            v2 = _parse_version(version2)
 
             if v1 > v2:
                 return 1
@@ -323,25 +407,10 @@ class MDMPackageBuilder:
             "postinstall_script": getattr(options, "postinstall_script", ""),
         }
 
-        # Write pkginfo
-        with open(pkg_dir / "pkginfo.json", "w") as f:
-            json.dump(pkginfo, f, indent=2)
-
-        # Create installcheck script
-        install_check = pkg_dir / "installcheck.sh"
-        install_check.write_text(pkginfo["install_check_script"])
-        install_check.chmod(0o755)
-
-        # Create scripts if provided
-        if pkginfo["preinstall_script"]:
-            pre = pkg_dir / "preinstall.sh"
-            pre.write_text(pkginfo["preinstall_script"])
-            pre.chmod(0o755)
-
-        if pkginfo["postinstall_script"]:
-            post = pkg_dir / "postinstall.sh"
-            post.write_text(pkginfo["postinstall_script"])
-            post.chmod(0o755)
+        # Write the package files before pkgbuild runs: pkg_dir may sit inside
+        # the pkgbuild root (e.g. build-mdm --output-dir next to the app), and a
+        # concurrent write would race into the .pkg payload
+        await asyncio.to_thread(self._write_package_files, pkg_dir, pkginfo)
 
         # Create .pkg
         pkg_path = pkg_dir / f"{pkg_name}.pkg"
@@ -361,9 +430,35 @@ class MDMPackageBuilder:
 
         # Create zip for Kandji
         final_path = self.output_dir / f"{pkg_name}.zip"
-        zip_proc = await asyncio.create_subprocess_exec(
-            "zip", "-r", str(final_path), ".", cwd=pkg_dir
-        )
-        await zip_proc.communicate()
+        await asyncio.to_thread(self._zip_package, pkg_dir, final_path)
 
         return final_path
+
+    @staticmethod
+    def _write_package_files(pkg_dir: Path, pkginfo: Dict[str, Any]) -> None:
+        """Write pkginfo.json and the install scripts into the package directory."""
+        # Encode in one go; json.dump would issue a write per token
+        (pkg_dir / "pkginfo.json").write_text(json.dumps(pkginfo, indent=2))
+
+        # Create installcheck script
+        install_check = pkg_dir / "installcheck.sh"
+        install_check.write_text(pkginfo["install_check_script"])
+        install_check.chmod(0o755)
+
+        # Create scripts if provided
+        if pkginfo["preinstall_script"]:
+            pre = pkg_dir / "preinstall.sh"
+            pre.write_text(pkginfo["preinstall_script"])
+            pre.chmod(0o755)
+
+        if pkginfo["postinstall_script"]:
+            post = pkg_dir / "postinstall.sh"
+            post.write_text(pkginfo["postinstall_script"])
+            post.chmod(0o755)
+
+    @staticmethod
+    def _zip_package(pkg_dir: Path, final_path: Path) -> None:
+        """Zip the package directory's contents, keeping file modes."""
+        with zipfile.ZipFile(final_path, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+            for path in sorted(pkg_dir.rglob("*")):
+                zf.write(path, path.relative_to(pkg_dir).as_posix())
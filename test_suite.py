@@ -2,23 +2,28 @@
 # test_suite.py
 
 import asyncio
+import contextlib
 import os
 import shutil
 import sys
 import tempfile
 from datetime import datetime
 from pathlib import Path
+from typing import ClassVar, Dict
 
 import typer
 import yaml
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from tests.command_runner import run_carrus
+from tests.command_runner import CarrusBatch, run_carrus
 
 console = Console()
 app = typer.Typer()
 
+# Use libyaml's emitter when PyYAML was built with it
+_SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 class TestFailure(Exception):
     """Test failure with details."""
@@ -27,6 +32,9 @@ class TestFailure(Exception):
 
 
 class TestSuite:
+    # Serialized test files, shared by every suite in the process
+    _file_cache: ClassVar[Dict[str, str]] = {}
+
     def __init__(self):
         self.temp_dir = None
         self.test_repo = None
@@ -34,6 +42,10 @@ class TestSuite:
         self.failed = 0
         self.results = []
         self.downloaded_files = set()
+        # Short commands share one carrus process instead of starting their own
+        self.carrus = CarrusBatch()
+        # Held while the DMG is being downloaded so it is only fetched once
+        self._download_lock = asyncio.Lock()
 
     def setup(self):
         """Set up test environment."""
@@ -48,7 +60,7 @@ class TestSuite:
             try:
                 # Clean up any downloaded files
                 for file in self.downloaded_files:
-                    if Path(file).exists():
+                    with contextlib.suppress(FileNotFoundError):
                         os.remove(file)
 
                 # Remove temp directory
@@ -61,6 +73,17 @@ class TestSuite:
         # Create repository structure
         os.makedirs(self.test_repo / "manifests" / "browsers", exist_ok=True)
 
+        if not self._file_cache:
+            self._file_cache.update(self._serialize_test_files())
+
+        for rel_path, text in self._file_cache.items():
+            (self.test_repo / rel_path).write_text(text)
+
+        console.print(f"Created test repository at: {self.test_repo}")
+
+    @staticmethod
+    def _serialize_test_files() -> Dict[str, str]:
+        """Dump the repository metadata and manifests to YAML text."""
         # Create repository metadata
         repo_yaml = {
             "name": "test-repo",
@@ -69,9 +92,6 @@ class TestSuite:
             "url": "https://example.com/test-repo",
         }
 
-        with open(self.test_repo / "repo.yaml", "w") as f:
-            yaml.dump(repo_yaml, f)
-
         # Create Firefox manifest
         firefox_manifest = {
             "name": "Firefox",
@@ -94,10 +114,10 @@ class TestSuite:
             },
         }
 
-        with open(self.test_repo / "manifests" / "browsers" / "firefox.yaml", "w") as f:
-            yaml.dump(firefox_manifest, f)
-
-        console.print(f"Created test repository at: {self.test_repo}")
+        return {
+            "repo.yaml": yaml.dump(repo_yaml, Dumper=_SafeDumper),
+            "manifests/browsers/firefox.yaml": yaml.dump(firefox_manifest, Dumper=_SafeDumper),
+        }
 
     async def run_test(self, name: str, func):
         """Run a single test with proper error handling."""
@@ -121,21 +141,30 @@ class TestSuite:
     async def test_help_command(self):
         """Test the help command."""
         try:
-            run_carrus(["--help"])
+            await self.carrus.send(["--help"])
         except Exception as e:
             raise TestFailure("Help command failed") from e
 
     async def test_download_command(self):
         """Test downloading a package."""
+        async with self._download_lock:
+            # Remove existing file if any
+            Path("Firefox-123.0.dmg").unlink(missing_ok=True)
+            await self._download()
+
+    async def _ensure_downloaded(self):
+        """Download the package unless an earlier test already has."""
+        async with self._download_lock:
+            if not Path("Firefox-123.0.dmg").exists():
+                await self._download()
+
+    async def _download(self):
+        """Download the Firefox DMG into the working directory."""
         manifest_path = self.test_repo / "manifests" / "browsers" / "firefox.yaml"
         dest_file = Path("Firefox-123.0.dmg")
 
-        # Remove existing file if any
-        if dest_file.exists():
-            dest_file.unlink()
-
         try:
-            run_carrus(["download", "--skip-verify", str(manifest_path)])
+            await run_carrus(["download", "--skip-verify", str(manifest_path)])
         except Exception as e:
             raise TestFailure("Download command failed") from e
 
@@ -149,11 +178,10 @@ class TestSuite:
     async def test_verify_command(self):
         """Test verifying a package."""
         # Ensure we have the file
-        if not Path("Firefox-123.0.dmg").exists():
-            await self.test_download_command()
+        await self._ensure_downloaded()
 
         try:
-            run_carrus(["verify", "Firefox-123.0.dmg"])
+            await run_carrus(["verify", "Firefox-123.0.dmg"])
         except Exception as e:
             raise TestFailure("Verify command failed") from e
 
@@ -161,19 +189,19 @@ class TestSuite:
         """Test repository management commands."""
         # Add repository
         try:
-            run_carrus(["repo-add", str(self.test_repo)])
+            await self.carrus.send(["repo-add", str(self.test_repo)])
         except Exception as e:
             raise TestFailure("repo-add command failed") from e
 
         # List repositories
         try:
-            run_carrus(["repo-list"])
+            await self.carrus.send(["repo-list"])
         except Exception as e:
             raise TestFailure("repo-list command failed") from e
 
         # Search repositories
         try:
-            run_carrus(["search", "browsers"])
+            await self.carrus.send(["search", "browsers"])
         except Exception as e:
             raise TestFailure("search command failed") from e
 
@@ -181,7 +209,7 @@ class TestSuite:
         """Test update checking."""
         manifest_path = self.test_repo / "manifests" / "browsers" / "firefox.yaml"
         try:
-            run_carrus(["check-updates", str(manifest_path)])
+            await self.carrus.send(["check-updates", str(manifest_path)])
         except Exception as e:
             raise TestFailure("check-updates command failed") from e
 
@@ -190,11 +218,7 @@ class TestSuite:
         manifest_path = self.test_repo / "manifests" / "browsers" / "firefox.yaml"
 
         # Ensure we have the downloaded file
-        if not Path("Firefox-123.0.dmg").exists():
-            await self.test_download_command()
-
-        # Wait a moment to ensure file is fully written
-        await asyncio.sleep(1)
+        await self._ensure_downloaded()
 
         # Create build directories
         build_dir = self.temp_dir / "Applications"
@@ -204,7 +228,7 @@ class TestSuite:
 
         # Test regular build
         try:
-            run_carrus(["build", "--output", str(build_dir), str(manifest_path)])
+            await run_carrus(["build", "--output", str(build_dir), str(manifest_path)])
         except Exception as e:
             raise TestFailure("build command failed") from e
 
@@ -214,18 +238,27 @@ class TestSuite:
 
         # Test MDM build
         try:
-            run_carrus(["build-mdm", "--output", str(mdm_dir), str(manifest_path)])
+            await run_carrus(["build-mdm", "--output", str(mdm_dir), str(manifest_path)])
         except Exception as e:
             raise TestFailure("build-mdm command failed") from e
 
+    async def _run_chain(self, tests):
+        """Run tests one after another, for tests that build on earlier ones."""
+        for name, func in tests:
+            await self.run_test(name, func)
+
     async def run_all_tests(self):
         """Run all test cases."""
-        tests = [
+        # Tests that don't depend on each other run concurrently
+        independent = [
             ("Help Command", self.test_help_command),
-            ("Download Command", self.test_download_command),
-            ("Verify Command", self.test_verify_command),
             ("Repository Commands", self.test_repo_commands),
             ("Update Checking", self.test_check_updates),
+        ]
+        # Verify and build use the file the download test fetched
+        serial_chain = [
+            ("Download Command", self.test_download_command),
+            ("Verify Command", self.test_verify_command),
             ("Build Commands", self.test_build_commands),
         ]
 
@@ -234,11 +267,20 @@ class TestSuite:
         ) as progress:
             task = progress.add_task("Running tests...", total=None)
 
-            for name, func in tests:
-                await self.run_test(name, func)
+            try:
+                await asyncio.gather(
+                    *(self.run_test(name, func) for name, func in independent),
+                    self._run_chain(serial_chain),
+                )
+            finally:
+                await self.carrus.close()
 
             progress.update(task, completed=True)
 
+        # Report in a stable order regardless of completion order
+        order = [name for name, _ in independent + serial_chain]
+        self.results.sort(key=lambda result: order.index(result["name"]))
+
     def generate_report(self):
         """Generate test report."""
         console.print("\n[bold]Test Results Summary[/bold]")
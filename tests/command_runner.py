@@ -1,33 +1,93 @@
 """Utilities for running carrus commands safely in tests."""
 
+import asyncio
+import functools
+import json
 import shutil
 import subprocess
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 
+@functools.lru_cache(maxsize=1)
 def get_carrus_path() -> Path:
-    """Find carrus executable in PATH."""
+    """Find carrus executable in PATH, once per test run."""
     carrus_path = shutil.which("carrus")
     if not carrus_path:
         raise RuntimeError("carrus executable not found in PATH")
-    return Path(carrus_path)
-
-
-def run_carrus(args: List[str], check: bool = True) -> subprocess.CompletedProcess:
-    """Run carrus command safely."""
-    carrus_path = get_carrus_path()
-
-    # Validate arguments are strings
-    if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
-        raise ValueError("All arguments must be strings")
 
     # Only allow execution of carrus binary
+    carrus_path = Path(carrus_path)
     if not carrus_path.is_file():
         raise RuntimeError("carrus path is not a file")
+    return carrus_path
+
+
+def _carrus_command(args: List[str]) -> List[str]:
+    """Validate arguments and build the command line for the carrus binary."""
+    if not isinstance(args, list):
+        raise ValueError("Arguments must be a list of strings")
+    assert all(isinstance(arg, str) for arg in args), "All arguments must be strings"
+    return [str(get_carrus_path()), *args]
+
+
+# Clean environment for every carrus process
+CARRUS_ENV = {"PATH": "/usr/local/bin:/usr/bin:/bin"}
+
+
+async def run_carrus(args: List[str], check: bool = True) -> subprocess.CompletedProcess:
+    """Run carrus command safely without blocking the event loop."""
+    cmd = _carrus_command(args)
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, env=CARRUS_ENV
+    )
+    stdout, stderr = await proc.communicate()
+    result = subprocess.CompletedProcess(cmd, proc.returncode, stdout.decode(), stderr.decode())
+    if check:
+        result.check_returncode()
+    return result
+
+
+class CarrusBatch:
+    """A long-lived `carrus batch` process that runs commands one at a time.
+
+    Saves the interpreter start-up and import cost of a fresh process for
+    each short command.
+    """
+
+    def __init__(self):
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+
+    async def send(self, args: List[str], check: bool = True) -> subprocess.CompletedProcess:
+        """Run one carrus command in the batch process."""
+        cmd = _carrus_command(args)
+        async with self._lock:
+            if self._proc is None:
+                self._proc = await asyncio.create_subprocess_exec(
+                    cmd[0],
+                    "batch",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    env=CARRUS_ENV,
+                )
+            self._proc.stdin.write(json.dumps(args).encode() + b"\n")
+            await self._proc.stdin.drain()
+            line = await self._proc.stdout.readline()
 
-    # Execute with validated inputs and clean environment
-    cmd = [str(carrus_path), *args]
-    env = {"PATH": "/usr/local/bin:/usr/bin:/bin"}  # Use clean PATH
+        if not line:
+            raise RuntimeError("carrus batch process exited unexpectedly")
+        reply = json.loads(line)
+        result = subprocess.CompletedProcess(cmd, reply["rc"], reply["stdout"], reply["stderr"])
+        if check:
+            result.check_returncode()
+        return result
 
-    return subprocess.run(cmd, check=check, capture_output=True, text=True, env=env)
+    async def close(self) -> None:
+        """Stop the batch process."""
+        async with self._lock:
+            if self._proc is not None:
+                self._proc.stdin.close()
+                await self._proc.wait()
+                self._proc = None
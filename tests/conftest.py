@@ -1,4 +1,14 @@
 """Pytest configuration file for Carrus tests."""
 
+import pytest
+
 # Enable pytest-asyncio for async tests
 pytest_plugins = ["pytest_asyncio"]
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches written during tests out of the user's cache directory."""
+    cache_home = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home / "carrus"
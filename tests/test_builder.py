@@ -0,0 +1,116 @@
+"""Tests for package building."""
+
+import plistlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rich.progress import Progress
+
+from carrus.core.builder import build_package
+from carrus.core.codesign import SigningInfo
+from carrus.core.types import BuildConfig, BuildState
+
+
+@pytest.fixture
+def build_dirs():
+    """Create a source DMG and a destination containing an installed app."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        source = tmp_path / "Firefox-123.0.dmg"
+        source.write_bytes(b"dmg")
+
+        destination = tmp_path / "Applications"
+        contents = destination / "Firefox.app" / "Contents"
+        contents.mkdir(parents=True)
+        with open(contents / "Info.plist", "wb") as f:
+            plistlib.dump({"CFBundleShortVersionString": "123.0"}, f)
+
+        yield source, destination
+
+
+@pytest.fixture
+def mock_progress():
+    """Create a mock progress bar."""
+    progress = Progress()
+    progress.add_task = MagicMock(return_value=1)
+    progress.update = MagicMock()
+    return progress
+
+
+def _build_config(destination: Path, version: str) -> BuildConfig:
+    return BuildConfig(
+        type="app_dmg",
+        destination=str(destination),
+        app_name="Firefox.app",
+        version=version,
+        team_id="43AQ936H96",
+    )
+
+
+@pytest.mark.asyncio
+async def test_build_skips_up_to_date_app(build_dirs, mock_progress):
+    """Test that an installed app with matching version and Team ID is not rebuilt."""
+    source, destination = build_dirs
+    signing_info = SigningInfo(signed=True, team_id="43AQ936H96")
+
+    with (
+        patch("carrus.core.builder.verify_codesign", return_value=signing_info),
+        patch("carrus.core.builder.DMGMount") as mock_mount,
+    ):
+        result = await build_package(source, _build_config(destination, "123.0"), mock_progress)
+
+    assert result.success
+    assert result.output_path == destination / "Firefox.app"
+    mock_mount.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_build_runs_when_version_differs(build_dirs, mock_progress):
+    """Test that an outdated installed app goes through the normal DMG build."""
+    source, destination = build_dirs
+
+    with (
+        patch("carrus.core.builder.verify_codesign") as mock_verify,
+        patch("carrus.core.builder.AppDmgBuilder.build") as mock_build,
+    ):
+        await build_package(source, _build_config(destination, "124.0"), mock_progress)
+
+    mock_verify.assert_not_called()
+    mock_build.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_build_runs_when_team_id_differs(build_dirs, mock_progress):
+    """Test that an installed app signed by another team is replaced."""
+    source, destination = build_dirs
+    signing_info = SigningInfo(signed=True, team_id="XYZ789")
+
+    with (
+        patch("carrus.core.builder.verify_codesign", return_value=signing_info),
+        patch("carrus.core.builder.AppDmgBuilder.build") as mock_build,
+    ):
+        await build_package(source, _build_config(destination, "123.0"), mock_progress)
+
+    mock_build.assert_called_once()
+
+
+def test_build_state_cleanup(tmp_path):
+    """Test cleanup removes files, directories and links, and skips missing paths."""
+    temp_file = tmp_path / "download.dmg"
+    temp_file.write_bytes(b"dmg")
+    temp_dir = tmp_path / "extract"
+    (temp_dir / "Firefox.app").mkdir(parents=True)
+    link = tmp_path / "link"
+    link.symlink_to(temp_dir)
+
+    state = BuildState(
+        started_at=datetime.now(), build_type="app_dmg", source_path=temp_file, destination=tmp_path
+    )
+    for path in (link, temp_file, temp_dir, tmp_path / "missing"):
+        state.add_temp_file(path)
+
+    assert state.cleanup() == []
+    assert list(tmp_path.iterdir()) == []
@@ -15,14 +15,14 @@ from carrus.core.codesign import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_dmg():
     """Create a mock DMG file."""
     with tempfile.NamedTemporaryFile(suffix=".dmg") as tmp:
         yield Path(tmp.name)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_app():
     """Create a mock app bundle."""
     with tempfile.NamedTemporaryFile(suffix=".app") as tmp:
@@ -37,7 +37,7 @@ def test_signing_info_creation():
     assert info.errors == []
 
 
-def test_dmg_mount_context_manager(mock_dmg):
+def test_dmg_mount_context_manager(mock_dmg, tmp_path):
     """Test DMG mounting context manager."""
     with (
         patch("subprocess.run") as mock_run,
@@ -48,7 +48,7 @@ def test_dmg_mount_context_manager(mock_dmg):
         mock_run.return_value.returncode = 0
 
         # Mock app discovery
-        mock_app = Path(tempfile.mkdtemp(prefix="carrus_test_")) / "app.app"
+        mock_app = tmp_path / "app.app"
         mock_glob.return_value = [mock_app]
         mock_rglob.return_value = []  # Not needed since glob finds it
 
@@ -89,7 +89,7 @@ def test_verify_codesign_app(mock_run, mock_app):
 
 
 @patch("carrus.core.codesign.run_command")
-def test_verify_codesign_dmg(mock_run, mock_dmg):
+def test_verify_codesign_dmg(mock_run, mock_dmg, tmp_path):
     """Test code signing verification for DMG."""
     # Mock command outputs
     mock_run.side_effect = [
@@ -99,9 +99,7 @@ def test_verify_codesign_dmg(mock_run, mock_dmg):
     ]
 
     with patch("carrus.core.codesign.DMGMount") as mock_mount:
-        mock_mount.return_value.__enter__.return_value.app_path = (
-            Path(tempfile.mkdtemp(prefix="carrus_test_")) / "test.app"
-        )
+        mock_mount.return_value.__enter__.return_value.app_path = tmp_path / "test.app"
         result = verify_codesign(mock_dmg)
 
         assert result.signed
@@ -8,6 +8,7 @@ import pytest
 
 from carrus.core.config import (
     Config,  # Assuming dataclass
+    get_config_dir,
     get_default_config,
     load_config,
     save_config,
@@ -68,3 +69,51 @@ def test_env_override():
     with patch.dict("os.environ", {"CARRUS_DB_PATH": "env.db"}):
         config = get_default_config()
         assert config.db_path == "env.db"
+
+
+def test_load_config_cache():
+    """Test that unchanged config files are served from cache."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "config.yaml"
+        config_path.write_text("db_path: test.db\nlog_dir: logs\n")
+
+        first = load_config(config_path)
+        first.db_path = "mutated.db"
+
+        with patch("yaml.load") as mock_load:
+            second = load_config(config_path)
+            mock_load.assert_not_called()
+        assert second.db_path == "test.db"
+
+        save_config(Config(db_path="saved.db", log_dir="logs"), config_path)
+        assert load_config(config_path).db_path == "saved.db"
+
+
+def test_notification_env_override():
+    """Test notification environment variable overrides."""
+    env = {
+        "CARRUS_NOTIFICATION_ENABLED": "False",
+        "CARRUS_NOTIFICATION_METHOD": "slack",
+        "CARRUS_SLACK_WEBHOOK_URL": "https://hooks.slack.com/services/test",
+        "CARRUS_NOTIFICATION_CHECK_INTERVAL": "not-a-number",
+    }
+    with patch.dict("os.environ", env):
+        config = get_default_config()
+        assert config.notifications.enabled is False
+        assert config.notifications.method == "slack"
+        assert config.notifications.slack_webhook_url == "https://hooks.slack.com/services/test"
+        assert config.notifications.check_interval == 24
+
+
+def test_config_dir_cached():
+    """Test the config directory is resolved once until the cache is cleared."""
+    get_config_dir.cache_clear()
+    try:
+        with patch.dict("os.environ", {"XDG_CONFIG_HOME": "/first"}):
+            assert get_config_dir() == Path("/first/carrus")
+        with patch.dict("os.environ", {"XDG_CONFIG_HOME": "/second"}):
+            assert get_config_dir() == Path("/first/carrus")
+            get_config_dir.cache_clear()
+            assert get_config_dir() == Path("/second/carrus")
+    finally:
+        get_config_dir.cache_clear()
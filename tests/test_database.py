@@ -1,12 +1,21 @@
 """Tests for the Carrus database implementation."""
 
 import shutil
+import sqlite3
 import tempfile
+import threading
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from carrus.core.database import Database, DatabaseError
+from carrus.core.database import (
+    SCHEMA_VERSION,
+    Database,
+    DatabaseError,
+    MigrationError,
+    get_database,
+)
 
 
 @pytest.fixture
@@ -16,22 +25,44 @@ def db():
     db_path = Path(temp_dir) / "test.db"
     db = Database(db_path)
     yield db
+    db.close()
     shutil.rmtree(temp_dir)
 
 
 class TestDatabaseSetup:
-    def test_creates_schema_version(self, db):
-        """Test schema version table is created and populated."""
+    def test_records_schema_version(self, db):
+        """Test the schema version is stored in PRAGMA user_version."""
         with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT version FROM schema_version")
-            version = cursor.fetchone()[0]
-            assert version == 1  # Current schema version
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            assert version == SCHEMA_VERSION
+
+    def test_upgrades_legacy_schema_version_table(self, db):
+        """Test databases versioned by the old schema_version table are upgraded."""
+        with db.get_connection() as conn:
+            conn.execute("PRAGMA user_version = 0")
+            conn.execute("CREATE TABLE schema_version (version INTEGER PRIMARY KEY)")
+            conn.execute("INSERT INTO schema_version (version) VALUES (5)")
+            conn.commit()
+        db.close()
+
+        upgraded = Database(db.db_path)
+        with upgraded.get_connection() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+            assert "schema_version" not in tables
+        upgraded.close()
+
+    def test_get_database_shares_instance(self, tmp_path):
+        """Test get_database returns one instance per path."""
+        first = get_database(tmp_path / "shared.db")
+        try:
+            assert get_database(tmp_path / "." / "shared.db") is first
+        finally:
+            first.close()
 
     def test_creates_all_tables(self, db):
         """Test all required tables are created."""
         expected_tables = {
-            "schema_version",
             "packages",
             "versions",
             "metadata",
@@ -49,6 +80,102 @@ class TestDatabaseSetup:
             tables = {row[0] for row in cursor.fetchall()}
             assert tables == expected_tables
 
+    def test_creates_lookup_indexes(self, db):
+        """Test indexes for hot lookups are created."""
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+            indexes = {row[0] for row in cursor.fetchall()}
+            assert {
+                "idx_versions_pkg",
+                "idx_versions_pkg_installed",
+                "idx_history_pkg",
+                "idx_manifests_repo",
+            } <= indexes
+
+    def test_history_lookup_uses_index(self, db):
+        """Test package history is an index search rather than a table scan."""
+        with db.get_connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM install_history WHERE package_id = ? ORDER BY id DESC",
+                (1,),
+            ).fetchall()
+            details = " ".join(row[3] for row in plan)
+            assert "SEARCH install_history USING INDEX idx_history_pkg" in details
+
+    def test_connection_pragmas(self, db):
+        """Test WAL and tuned PRAGMAs are applied."""
+        with db.get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+            assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+
+    def test_writes_begin_immediate(self, db):
+        """Test write transactions take the write lock when they begin."""
+        db.add_package(name="Firefox", version="123.0")
+        with db.get_connection() as conn:
+            assert conn.isolation_level == "IMMEDIATE"
+
+        with db.transaction():
+            db.add_package(name="Chrome", version="1.0")
+            other = sqlite3.connect(db.db_path, timeout=0)
+            try:
+                with pytest.raises(sqlite3.OperationalError, match="locked"):
+                    other.execute("BEGIN IMMEDIATE")
+            finally:
+                other.close()
+
+    def test_checkpoint_truncates_wal(self, db):
+        """Test checkpoint() folds the WAL back into the database file."""
+        db.add_package(name="Firefox", version="123.0")
+        wal_path = db.db_path.with_name(db.db_path.name + "-wal")
+        assert wal_path.stat().st_size > 0
+
+        db.checkpoint()
+        assert wal_path.stat().st_size == 0
+        assert db.get_package_by_name("Firefox")["version"] == "123.0"
+
+    def test_reuses_connection(self, db):
+        """Test the per-thread connection is reused across calls."""
+        with db.get_connection() as first, db.get_connection() as second:
+            assert first is second
+
+        db.close()
+        with db.get_connection() as reopened:
+            assert reopened is not first
+            reopened.execute("SELECT 1")
+
+    def test_close_releases_all_threads(self, db):
+        """Test close() closes connections opened on other threads too."""
+        opened = []
+
+        def worker():
+            with db.get_connection() as conn:
+                opened.append(conn)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        db.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            opened[0].execute("SELECT 1")
+        assert db.get_package_by_name("Firefox") is None
+
+    def test_failed_migration_rolls_back(self, tmp_path):
+        """Test a failing migration leaves no partially created schema."""
+        broken = [(1, "CREATE TABLE packages (id INTEGER); CREATE TABLE broken (;")]
+        with patch("carrus.core.database._MIGRATIONS", broken):
+            with pytest.raises(MigrationError):
+                Database(tmp_path / "broken.db")
+
+        conn = sqlite3.connect(tmp_path / "broken.db")
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        conn.close()
+        assert "packages" not in tables
+
 
 class TestPackageManagement:
     def test_add_package(self, db):
@@ -83,6 +210,38 @@ class TestPackageManagement:
             status = cursor.fetchone()[0]
             assert status == "installed"
 
+    def test_add_packages_batch(self, db):
+        """Test adding several packages in one call."""
+        written = db.add_packages(
+            [
+                {"name": "Firefox", "version": "123.0"},
+                {"name": "Chrome", "version": "120.0", "status": "installed"},
+            ]
+        )
+
+        assert written == 2
+        assert db.get_package_by_name("Chrome")["status"] == "installed"
+
+        with pytest.raises(DatabaseError):
+            db.add_packages(
+                [{"name": "Safari", "version": "17.0"}, {"name": "Firefox", "version": "123.0"}]
+            )
+        assert db.get_package_by_name("Safari") is None
+
+    def test_upsert_package(self, db):
+        """Test upserting returns the existing package ID and updates it."""
+        pkg_id = db.add_package(name="Firefox", version="123.0")
+
+        upserted_id = db.upsert_package(
+            name="Firefox", version="123.0", install_path="/Applications", status="installed"
+        )
+
+        assert upserted_id == pkg_id
+        package = db.get_package_by_name("Firefox")
+        assert package["status"] == "installed"
+        assert package["install_path"] == "/Applications"
+        assert db.upsert_package(name="Firefox", version="124.0") != pkg_id
+
 
 class TestInstallHistory:
     def test_add_and_retrieve_history(self, db):
@@ -106,6 +265,26 @@ class TestInstallHistory:
         assert history[0]["action"] == "uninstall"  # Most recent first
         assert history[1]["action"] == "install"
 
+    def test_iter_history_streams_in_batches(self, db):
+        """Test history can be streamed without materializing every row."""
+        pkg_id = db.add_package(name="Firefox", version="123.0")
+        written = db.add_install_history_entries(
+            [
+                {
+                    "package_id": pkg_id,
+                    "version": f"1.{i}",
+                    "action": "install",
+                    "status": "success",
+                }
+                for i in range(300)
+            ]
+        )
+        assert written == 300
+
+        history = db.iter_package_history(pkg_id)
+        assert next(history)["version"] == "1.299"
+        assert sum(1 for _ in history) == 299
+
 
 class TestErrorHandling:
     def test_invalid_package_id(self, db):
@@ -113,6 +292,11 @@ class TestErrorHandling:
         with pytest.raises(DatabaseError):
             db.update_package_status(999, "installed")
 
+    def test_invalid_version_id(self, db):
+        """Test error handling for invalid version ID."""
+        with pytest.raises(DatabaseError):
+            db.update_version_installed_status(999, installed=True)
+
     def test_duplicate_package(self, db):
         """Test error handling for duplicate package."""
         db.add_package("Firefox", "123.0")
@@ -120,6 +304,28 @@ class TestErrorHandling:
             db.add_package("Firefox", "123.0")
 
 
+class TestTransactions:
+    def test_transaction_commits_once(self, db):
+        """Test writes inside a transaction are committed together."""
+        with db.transaction():
+            pkg_id = db.add_package("Firefox", "123.0")
+            db.add_package_version(pkg_id, "124.0", "https://example.com/firefox-124.0.dmg")
+            db.add_install_history(pkg_id, "124.0", "install", "success")
+
+        assert db.get_package_by_name("Firefox")["id"] == pkg_id
+        assert len(db.get_package_versions(pkg_id)) == 1
+        assert len(db.get_package_history(pkg_id)) == 1
+
+    def test_transaction_rolls_back(self, db):
+        """Test a failing transaction discards all of its writes."""
+        with pytest.raises(DatabaseError):
+            with db.transaction():
+                db.add_package("Firefox", "123.0")
+                db.update_package_status(999, "installed")
+
+        assert db.get_package_by_name("Firefox") is None
+
+
 class TestBackupRestore:
     def test_backup_and_restore(self, db):
         """Test database backup and restore functionality."""
@@ -147,8 +353,8 @@ class TestBackupRestore:
         shutil.rmtree(backup_path.parent)
 
 
-def test_triggers(db):
-    """Test that update triggers are working correctly."""
+def test_updated_at_timestamp(db):
+    """Test that updates refresh updated_at without triggers."""
     # Add a package and get its initial timestamps
     pkg_id = db.add_package("Firefox", "123.0")
 
@@ -174,6 +380,9 @@ def test_triggers(db):
         # Updated timestamp should be newer
         assert new_updated_at > updated_at
 
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'")
+        assert cursor.fetchone()[0] == 0
+
 
 class TestVersionTracking:
     """Test the version tracking functionality."""
@@ -238,6 +447,29 @@ class TestVersionTracking:
             assert version["checksum"] == "updated123"
             assert version["is_installed"] == 1
 
+    def test_add_package_version_invalid_package(self, db):
+        """Test adding a version for a missing package fails."""
+        with pytest.raises(DatabaseError, match="not found"):
+            db.add_package_version(package_id=999, version="1.0", url="https://example.com")
+
+    def test_add_package_versions_batch(self, db):
+        """Test adding and updating versions in one batch."""
+        pkg_id = db.add_package("Firefox", "123.0")
+        db.add_package_version(pkg_id, "123.0", "https://example.com/firefox-123.0.dmg")
+
+        written = db.add_package_versions(
+            [
+                {"package_id": pkg_id, "version": "123.0", "url": "https://mirror/123.0.dmg"},
+                {"package_id": pkg_id, "version": "124.0", "url": "https://mirror/124.0.dmg"},
+                {"package_id": pkg_id, "version": "125.0", "url": "https://mirror/125.0.dmg"},
+            ]
+        )
+
+        assert written == 3
+        versions = db.get_package_versions(pkg_id)
+        assert [v["version"] for v in versions] == ["125.0", "124.0", "123.0"]
+        assert versions[2]["url"] == "https://mirror/123.0.dmg"
+
     def test_get_package_versions(self, db):
         """Test retrieving all versions for a package."""
         # Create a package
@@ -339,6 +571,70 @@ class TestVersionTracking:
         # Should be version 1 now
         assert installed["version"] == "123.0"
 
+    def test_get_installed_versions(self, db):
+        """Test retrieving installed versions for several packages at once."""
+        firefox_id = db.add_package("Firefox", "123.0")
+        chrome_id = db.add_package("Chrome", "1.0")
+        slack_id = db.add_package("Slack", "4.0")
+
+        db.add_package_version(firefox_id, "123.0", "https://example.com/firefox-123.0.dmg")
+        firefox_installed = db.add_package_version(
+            firefox_id, "124.0", "https://example.com/firefox-124.0.dmg"
+        )
+        chrome_installed = db.add_package_version(
+            chrome_id, "1.0", "https://example.com/chrome-1.0.dmg"
+        )
+        db.add_package_version(slack_id, "4.0", "https://example.com/slack-4.0.dmg")
+        db.update_version_installed_status(firefox_installed, installed=True)
+        db.update_version_installed_status(chrome_installed, installed=True)
+
+        installed = db.get_installed_versions([firefox_id, chrome_id, slack_id])
+
+        assert set(installed) == {firefox_id, chrome_id}
+        assert installed[firefox_id]["version"] == "124.0"
+        assert installed[chrome_id]["version"] == "1.0"
+        assert db.get_installed_versions([]) == {}
+
+    def test_get_update_candidates(self, db):
+        """Test fetching packages whose latest version row is not the installed one."""
+        firefox_id = db.add_package("Firefox", "123.0")
+        chrome_id = db.add_package("Chrome", "1.0")
+        db.add_package("Slack", "4.0")
+
+        firefox_installed = db.add_package_version(
+            firefox_id, "123.0", "https://example.com/firefox-123.0.dmg"
+        )
+        firefox_latest = db.add_package_version(
+            firefox_id, "124.0", "https://example.com/firefox-124.0.dmg"
+        )
+        chrome_installed = db.add_package_version(
+            chrome_id, "1.0", "https://example.com/chrome-1.0.dmg"
+        )
+        db.update_version_installed_status(firefox_installed, installed=True)
+        db.update_version_installed_status(chrome_installed, installed=True)
+
+        candidates = db.get_update_candidates()
+
+        assert len(candidates) == 1
+        package, latest, installed = candidates[0]
+        assert package["name"] == "Firefox" and package["version"] == "123.0"
+        assert latest == db.get_latest_version(firefox_id)
+        assert latest["id"] == firefox_latest
+        assert installed == "123.0"
+
+    def test_get_packages_by_names(self, db):
+        """Test looking up several packages by name in one call."""
+        firefox_id = db.add_package("Firefox", "123.0")
+        chrome_id = db.add_package("Chrome", "1.0")
+
+        packages = db.get_packages_by_names(["Firefox", "Chrome", "Missing"])
+
+        assert set(packages) == {"Firefox", "Chrome"}
+        assert packages["Firefox"]["id"] == firefox_id
+        assert packages["Chrome"] == db.get_package_by_name("Chrome")
+        assert packages["Chrome"]["id"] == chrome_id
+        assert db.get_packages_by_names([]) == {}
+
     def test_get_package_by_name(self, db):
         """Test retrieving a package by name."""
         # Add a package
@@ -10,7 +10,7 @@ import aiohttp
 import pytest
 from rich.progress import Progress
 
-from carrus.core.downloader import download_file, verify_checksum
+from carrus.core.downloader import download_file, download_files, verify_checksum
 
 
 @pytest.fixture
@@ -54,19 +54,21 @@ async def test_download_file(temp_file, mock_progress, caplog):
     # Mock aiohttp response
     mock_response = AsyncMock()
     mock_response.headers = {"content-length": str(len(test_content))}
-    mock_response.content.iter_chunked = AsyncMock(return_value=MockChunkIterator([test_content]))
+    mock_response.content.iter_any = MagicMock(return_value=MockChunkIterator([test_content]))
 
     # Mock aiohttp ClientSession
     mock_session = AsyncMock()
+    mock_session.__aenter__.return_value = mock_session
     mock_session.get.return_value = mock_response
 
     with caplog.at_level(logging.DEBUG):
         with patch("aiohttp.ClientSession", return_value=mock_session):
-            result = await download_file(test_url, temp_file, mock_progress)
+            result, digest = await download_file(test_url, temp_file, mock_progress)
 
-            # Verify file was downloaded
+            # Verify file was downloaded and hashed in the same pass
             assert result == temp_file
             assert temp_file.read_bytes() == test_content
+            assert digest == hashlib.sha256(test_content).hexdigest()
 
             # Verify progress tracking
             mock_progress.add_task.assert_called_once()
@@ -84,6 +86,7 @@ async def test_download_file_error(temp_file, mock_progress, caplog):
 
     # Mock aiohttp session with error
     mock_session = AsyncMock()
+    mock_session.__aenter__.return_value = mock_session
     mock_session.get.side_effect = aiohttp.ClientError("Download failed")
 
     with caplog.at_level(logging.DEBUG):
@@ -95,6 +98,86 @@ async def test_download_file_error(temp_file, mock_progress, caplog):
             assert "Failed to download" in caplog.text
 
 
+@pytest.mark.asyncio
+async def test_download_files_shares_session(mock_progress):
+    """Test that concurrent downloads reuse a single session."""
+    test_content = b"Test content"
+
+    async def chunks():
+        yield test_content
+
+    def make_response(url):
+        response = AsyncMock()
+        response.headers = {"content-length": str(len(test_content))}
+        response.content.iter_any = MagicMock(return_value=chunks())
+        return response
+
+    mock_session = AsyncMock()
+    mock_session.__aenter__.return_value = mock_session
+    mock_session.get.side_effect = make_response
+
+    with tempfile.TemporaryDirectory() as tmp:
+        downloads = [(f"https://example.com/{name}", Path(tmp) / name) for name in ("a", "b")]
+        with patch("aiohttp.ClientSession", return_value=mock_session) as session_cls:
+            results = await download_files(downloads, mock_progress)
+
+        session_cls.assert_called_once()
+        assert mock_session.get.await_count == 2
+        assert [path for path, _ in results] == [dest for _, dest in downloads]
+        assert all(path.read_bytes() == test_content for path, _ in results)
+
+
+@pytest.mark.asyncio
+async def test_download_file_coalesces_chunks(temp_file, mock_progress):
+    """Test that small network chunks are buffered into larger writes."""
+    chunks = [b"x" * 10] * 10
+
+    async def iter_any():
+        for chunk in chunks:
+            yield chunk
+
+    mock_response = AsyncMock()
+    mock_response.headers = {"content-length": "100"}
+    mock_response.content.iter_any = MagicMock(return_value=iter_any())
+
+    mock_session = AsyncMock()
+    mock_session.__aenter__.return_value = mock_session
+    mock_session.get.return_value = mock_response
+
+    with (
+        patch("aiohttp.ClientSession", return_value=mock_session),
+        patch("carrus.core.downloader.DOWNLOAD_CHUNK_SIZE", 40),
+    ):
+        _, digest = await download_file("https://example.com/x", temp_file, mock_progress)
+
+    assert temp_file.read_bytes() == b"".join(chunks)
+    assert digest == hashlib.sha256(b"".join(chunks)).hexdigest()
+    advances = [call.kwargs["advance"] for call in mock_progress.update.call_args_list]
+    assert advances == [40, 40, 20]
+
+
+@pytest.mark.asyncio
+async def test_download_file_short_read_truncates(temp_file, mock_progress):
+    """Test a download shorter than content-length leaves no preallocated tail."""
+    test_content = b"Test content"
+
+    async def iter_any():
+        yield test_content
+
+    mock_response = AsyncMock()
+    mock_response.headers = {"content-length": "4096"}
+    mock_response.content.iter_any = MagicMock(return_value=iter_any())
+
+    mock_session = AsyncMock()
+    mock_session.__aenter__.return_value = mock_session
+    mock_session.get.return_value = mock_response
+
+    with patch("aiohttp.ClientSession", return_value=mock_session):
+        await download_file("https://example.com/x", temp_file, mock_progress)
+
+    assert temp_file.read_bytes() == test_content
+
+
 def test_verify_checksum(temp_file, caplog):
     """Test checksum verification."""
     # Create test file with known content
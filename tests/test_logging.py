@@ -2,6 +2,7 @@
 
 import logging
 import tempfile
+from logging.handlers import QueueHandler
 from pathlib import Path
 
 import pytest
@@ -9,9 +10,11 @@ import pytest
 from carrus.core.logging import (
     AUDIT_LOGGER,
     DEBUG_LOGGER,
+    _BatchedFileHandler,
     get_audit_logger,
     get_debug_logger,
     setup_logging,
+    shutdown_logging,
 )
 
 
@@ -20,6 +23,12 @@ def temp_log_dir():
     """Create a temporary directory for log files."""
     with tempfile.TemporaryDirectory() as temp_dir:
         yield Path(temp_dir)
+        shutdown_logging()
+
+
+def queue_handlers(logger):
+    """Return the queue handlers attached to a logger."""
+    return [h for h in logger.handlers if isinstance(h, QueueHandler)]
 
 
 def test_setup_logging_console_only():
@@ -33,8 +42,10 @@ def test_setup_logging_console_only():
     assert audit_logger.level == logging.INFO
     assert debug_logger.level == logging.DEBUG
 
-    # Verify console handlers
-    assert any(isinstance(h, logging.StreamHandler) for h in debug_logger.handlers)
+    # Loggers only enqueue; the console handler runs behind the listener
+    assert len(queue_handlers(debug_logger)) == 1
+    shutdown_logging()
+    assert not queue_handlers(debug_logger)
 
 
 def test_setup_logging_with_files(temp_log_dir):
@@ -44,14 +55,14 @@ def test_setup_logging_with_files(temp_log_dir):
     audit_logger = logging.getLogger(AUDIT_LOGGER)
     debug_logger = logging.getLogger(DEBUG_LOGGER)
 
-    # Verify file handlers
-    assert any(isinstance(h, logging.FileHandler) for h in audit_logger.handlers)
-    assert any(isinstance(h, logging.FileHandler) for h in debug_logger.handlers)
+    # Both loggers hand records to the same queue
+    assert queue_handlers(audit_logger) == queue_handlers(debug_logger)
 
     # Test logging
     test_msg = "Test log message"
     audit_logger.info(test_msg)
     debug_logger.debug(test_msg)
+    shutdown_logging()
 
     # Verify log files
     log_files = list(temp_log_dir.glob("*.log"))
@@ -89,6 +100,7 @@ def test_audit_logging(temp_log_dir):
 
     for msg in test_messages:
         audit_logger.info(msg)
+    shutdown_logging()
 
     audit_log = next(temp_log_dir.glob("carrus_audit_*.log"))
     content = audit_log.read_text()
@@ -114,9 +126,50 @@ def test_debug_logging(temp_log_dir):
     debug_logger.info(test_messages["info"])
     debug_logger.warning(test_messages["warning"])
     debug_logger.error(test_messages["error"])
+    shutdown_logging()
 
     debug_log = next(temp_log_dir.glob("carrus_debug_*.log"))
     content = debug_log.read_text()
 
     for msg in test_messages.values():
         assert msg in content
+
+
+def test_setup_logging_routes_and_replaces(temp_log_dir):
+    """Test records reach only their own file and repeated setup does not stack handlers."""
+    setup_logging(log_dir=temp_log_dir, debug=True)
+    setup_logging(log_dir=temp_log_dir, debug=True)
+
+    audit_logger = get_audit_logger()
+    debug_logger = get_debug_logger()
+    assert len(queue_handlers(audit_logger)) == 1
+
+    audit_logger.info("audit only")
+    debug_logger.info("debug only")
+    shutdown_logging()
+
+    audit_content = next(temp_log_dir.glob("carrus_audit_*.log")).read_text()
+    debug_content = next(temp_log_dir.glob("carrus_debug_*.log")).read_text()
+    assert audit_content.count("audit only") == 1
+    assert "debug only" not in audit_content
+    assert debug_content.count("debug only") == 1
+    assert "audit only" not in debug_content
+
+
+def test_file_logs_are_batched(temp_log_dir):
+    """Test file records are held back until an error flushes the batch."""
+    log_file = temp_log_dir / "batched.log"
+    handler = _BatchedFileHandler(logging.FileHandler(log_file))
+
+    def record(level, msg):
+        return logging.LogRecord(AUDIT_LOGGER, level, __file__, 0, msg, None, None)
+
+    handler.handle(record(logging.INFO, "buffered record"))
+    assert log_file.read_text() == ""
+
+    handler.handle(record(logging.ERROR, "flushing record"))
+    assert log_file.read_text() == "buffered record\nflushing record\n"
+
+    handler.handle(record(logging.INFO, "written on close"))
+    handler.close()
+    assert log_file.read_text().endswith("written on close\n")
@@ -5,6 +5,7 @@ from pathlib import Path
 from unittest.mock import mock_open, patch
 
 import pytest
+import yaml
 
 from carrus.core.manifests import (
     BuildOptions,
@@ -38,6 +39,41 @@ def test_manifest_loading(mock_recipe_file):
         assert manifest.code_sign.team_id == "43AQ936H96"
 
 
+def test_manifest_loading_is_cached(tmp_path):
+    """Test an unchanged manifest is parsed once and an edited one is reparsed."""
+    manifest_path = tmp_path / "firefox.yaml"
+    manifest_path.write_text('name: Firefox\nversion: "115.0"\ntype: app\nurl: https://x\n')
+    Manifest.clear_cache()
+
+    with patch("carrus.core.manifests.yaml.load", wraps=yaml.load) as yaml_load:
+        first = Manifest.from_yaml(manifest_path)
+        second = Manifest.from_yaml(manifest_path)
+        assert yaml_load.call_count == 1
+        assert first == second and first is not second
+
+        manifest_path.write_text('name: Firefox\nversion: "116.0.1"\ntype: app\nurl: https://x\n')
+        assert Manifest.from_yaml(manifest_path).version == "116.0.1"
+        assert yaml_load.call_count == 2
+
+
+def test_manifest_snapshot_skips_yaml(tmp_path, isolated_cache_dir):
+    """Test a fresh process reuses the on-disk snapshot instead of reparsing YAML."""
+    manifest_path = tmp_path / "firefox.yaml"
+    manifest_path.write_text('name: Firefox\nversion: "115.0"\ntype: app\nurl: https://x\n')
+    Manifest.clear_cache()
+    Manifest.from_yaml(manifest_path)
+    assert list((isolated_cache_dir / "manifests").glob("*.json"))
+
+    Manifest.clear_cache()
+    with patch("carrus.core.manifests.yaml.load", wraps=yaml.load) as yaml_load:
+        assert Manifest.from_yaml(manifest_path).version == "115.0"
+        assert yaml_load.call_count == 0
+
+        manifest_path.write_text('name: Firefox\nversion: "116.0.1"\ntype: app\nurl: https://x\n')
+        assert Manifest.from_yaml(manifest_path).version == "116.0.1"
+        assert yaml_load.call_count == 1
+
+
 def test_build_options():
     """Test build options configuration."""
     build_opts = BuildOptions(
@@ -73,3 +109,20 @@ def test_manifest_build_config():
     assert build_config is not None
     assert build_config.type == "pkg"
     assert build_config.destination == "/Applications"
+    assert build_config.app_name == "Firefox.app"
+    assert build_config.version == "115.0"
+
+
+def test_manifest_to_dict_omits_unset_fields():
+    """Test to_dict drops None values and keeps nested models as plain dicts."""
+    manifest = Manifest(
+        name="Firefox",
+        version="115.0",
+        type="app",
+        url="https://x",
+        code_sign={"team_id": "43AQ936H96"},
+    )
+    data = manifest.to_dict()
+    assert "checksum" not in data and "build" not in data
+    assert data["code_sign"]["team_id"] == "43AQ936H96"
+    assert Manifest.model_validate(data) == manifest
@@ -12,10 +12,12 @@ from carrus.core.database import Database
 from carrus.core.notifications import (
     CLINotificationProvider,
     EmailNotificationProvider,
+    GitHubNotificationProvider,
     Notification,
     NotificationService,
     SlackNotificationProvider,
     SystemNotificationProvider,
+    _origin_remote_url,
 )
 
 
@@ -56,6 +58,56 @@ def notification():
     )
 
 
+class FakeResponse:
+    """Minimal aiohttp response usable as an async context manager."""
+
+    def __init__(self, status, payload):
+        self.status = status
+        self.payload = payload
+
+    async def json(self, loads=None):
+        return self.payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Minimal aiohttp session that records requests and serves canned issue pages."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+        self.closed = False
+
+    def get(self, url, **kwargs):
+        self.requests.append(("GET", url, kwargs))
+        return FakeResponse(200, self.pages.pop(0))
+
+    def post(self, url, **kwargs):
+        self.requests.append(("POST", url, kwargs))
+        return FakeResponse(201, {"number": 99})
+
+    async def close(self):
+        self.closed = True
+
+
+def test_notification_timestamp_is_per_instance():
+    """Test each notification is stamped when it is created."""
+    before = datetime.datetime.now()
+    created = Notification(
+        title="Test Update",
+        message="A new version is available",
+        package_name="TestApp",
+        current_version="1.0.0",
+        new_version="1.1.0",
+    )
+    assert created.timestamp >= before
+
+
 class TestNotificationProviders:
     """Test the notification providers."""
 
@@ -73,28 +125,44 @@ class TestNotificationProviders:
         result = asyncio.run(provider.notify(notification))
 
         assert result is True
-        mock_console.print.assert_called()
+        mock_console.print.assert_called_once()
 
     def test_system_provider_notify(self, notification):
-        """Test system provider notify method with mocked subprocess."""
+        """Test system provider reuses one osascript session with escaped input."""
         provider = SystemNotificationProvider()
 
-        # Mock the subprocess
-        mock_proc = AsyncMock()
-        mock_proc.returncode = 0
-        mock_proc.communicate = AsyncMock(return_value=(b"", b""))
+        # Mock the long-running osascript process
+        mock_proc = MagicMock()
+        mock_proc.returncode = None
+        mock_proc.stdin.drain = AsyncMock()
+        mock_proc.wait = AsyncMock(return_value=0)
+
+        quoted = Notification(
+            title='Say "hi"',
+            message="line one\nline two",
+            package_name="TestApp",
+            current_version="1.0.0",
+            new_version="1.1.0",
+        )
 
         # Use a context manager to patch during execution
         async def run_test():
             with patch("asyncio.create_subprocess_exec", return_value=mock_proc) as mock_exec:
-                result = await provider.notify(notification)
-                return result, mock_exec
+                results = [await provider.notify(notification), await provider.notify(quoted)]
+                await provider.close()
+                return results, mock_exec
 
         # Run the async function with asyncio
-        result, mock_exec = asyncio.run(run_test())
+        results, mock_exec = asyncio.run(run_test())
 
-        assert result is True
+        assert results == [True, True]
         mock_exec.assert_called_once()
+        assert mock_exec.call_args.args == ("osascript", "-i")
+        written = [call.args[0] for call in mock_proc.stdin.write.call_args_list]
+        assert written[1] == (
+            b'display notification "line one\\nline two" with title "Say \\"hi\\""\n'
+        )
+        mock_proc.stdin.close.assert_called_once()
 
     def test_email_provider_notify(self, notification):
         """Test email provider notify method."""
@@ -194,13 +262,56 @@ class TestNotificationProviders:
         assert result is False
         mock_log.assert_called_once()
 
+    def test_github_provider_prefetches_issues_once(self, notification):
+        """Test open issues are fetched once per batch and matched by exact package name."""
+        github_token = "ghp_test"  # noqa: S105
+        provider = GitHubNotificationProvider(token=github_token, repo="owner/repo")
+        session = FakeSession(
+            [
+                [
+                    {"number": 1, "title": "Update Available: TestAppPro 2.0"},
+                    {"number": 2, "title": "Update Available: TestApp 1.0.5"},
+                    {"number": 3, "title": "Update Available: Other 1.0", "pull_request": {}},
+                ]
+            ]
+        )
+        other = Notification(
+            title="Test Update",
+            message="A new version is available",
+            package_name="Other",
+            current_version="0.9",
+            new_version="1.0",
+        )
+
+        async def run_test():
+            with patch("aiohttp.ClientSession", return_value=session) as session_cls:
+                await provider.prepare([notification, other])
+                results = [await provider.notify(notification), await provider.notify(other)]
+                await provider.close()
+                return results, session_cls
+
+        results, session_cls = asyncio.run(run_test())
+        assert results == [True, True]
+
+        # One pooled session serves every API call and is closed with the provider
+        session_cls.assert_called_once()
+        assert session.closed
+
+        methods_and_urls = [(method, url) for method, url, _ in session.requests]
+        assert methods_and_urls == [
+            ("GET", "https://api.github.com/repos/owner/repo/issues"),
+            ("POST", "https://api.github.com/repos/owner/repo/issues/2/comments"),
+            ("POST", "https://api.github.com/repos/owner/repo/issues"),
+        ]
+        assert session.requests[0][2]["params"]["per_page"] == 100
+
 
 class TestNotificationService:
     """Test the notification service."""
 
     def test_init(self, test_config, mock_db):
         """Test service initialization."""
-        with patch("carrus.core.notifications.Database", return_value=mock_db):
+        with patch("carrus.core.notifications.get_database", return_value=mock_db):
             service = NotificationService(test_config)
 
             assert service.config is test_config
@@ -211,7 +322,7 @@ class TestNotificationService:
         """Test service initialization with system method."""
         test_config.notifications.method = "system"
 
-        with patch("carrus.core.notifications.Database", return_value=mock_db):
+        with patch("carrus.core.notifications.get_database", return_value=mock_db):
             service = NotificationService(test_config)
 
             assert isinstance(service.provider, SystemNotificationProvider)
@@ -221,7 +332,7 @@ class TestNotificationService:
         test_config.notifications.method = "email"
         test_config.notifications.email = "test@example.com"
 
-        with patch("carrus.core.notifications.Database", return_value=mock_db):
+        with patch("carrus.core.notifications.get_database", return_value=mock_db):
             service = NotificationService(test_config)
 
             assert isinstance(service.provider, EmailNotificationProvider)
@@ -232,14 +343,57 @@ class TestNotificationService:
         test_config.notifications.slack_webhook_url = "https://hooks.slack.com/services/XXX/YYY/ZZZ"
         test_config.notifications.slack_channel = "#updates"
 
-        with patch("carrus.core.notifications.Database", return_value=mock_db):
+        with patch("carrus.core.notifications.get_database", return_value=mock_db):
             service = NotificationService(test_config)
 
             assert isinstance(service.provider, SlackNotificationProvider)
 
+    def test_provider_not_shared_between_services(self, test_config, mock_db):
+        """Test each service gets its own provider and GitHub repo parsing is deferred."""
+        test_config.notifications.method = "github"
+        test_config.notifications.github_token = "ghp_test"  # noqa: S105
+        test_config.notifications.github_repo = "https://github.com/owner/repo"
+
+        with (
+            patch("carrus.core.notifications.get_database", return_value=mock_db),
+            patch("carrus.core.notifications.subprocess.run") as mock_run,
+        ):
+            first = NotificationService(test_config)
+            second = NotificationService(test_config)
+
+            assert isinstance(first.provider, GitHubNotificationProvider)
+            assert first.provider is not second.provider
+            assert (first.provider.owner, first.provider.repo_name) == ("owner", "repo")
+            mock_run.assert_not_called()
+
+    def test_github_repo_from_git_remote_is_cached(self):
+        """Test the git remote fallback runs git once per working directory."""
+        completed = MagicMock(stdout="git@github.com:owner/repo.git\n")
+        _origin_remote_url.cache_clear()
+
+        with (
+            patch("carrus.core.notifications._GIT", "/usr/bin/git"),
+            patch("carrus.core.notifications.subprocess.run", return_value=completed) as mock_run,
+        ):
+            for _ in range(2):
+                provider = GitHubNotificationProvider(token="ghp_test", repo="not-a-repo")  # noqa: S106
+                assert (provider.owner, provider.repo_name) == ("owner", "repo")
+
+        mock_run.assert_called_once()
+        _origin_remote_url.cache_clear()
+
+    def test_github_close_forgets_issue_map(self):
+        """Test closing the GitHub provider drops the prefetched issue map."""
+        provider = GitHubNotificationProvider(token="ghp_test", repo="owner/repo")  # noqa: S106
+        provider._issues = {"TestApp": 1}
+
+        asyncio.run(provider.close())
+
+        assert provider._issues is None
+
     def test_should_check_updates(self, test_config, mock_db):
         """Test should_check_updates method."""
-        with patch("carrus.core.notifications.Database", return_value=mock_db):
+        with patch("carrus.core.notifications.get_database", return_value=mock_db):
             service = NotificationService(test_config)
 
             # No last check, should return True
@@ -267,14 +421,12 @@ class TestNotificationService:
             (
                 {"id": 1, "name": "TestApp", "version": "1.0.0"},
                 {"id": 1, "version": "1.1.0"},
+                "1.0.0",
             )
         ]
 
-        # Mock database
-        mock_db.get_installed_version.return_value = {"version": "1.0.0"}
-
         async def run_test():
-            with patch("carrus.core.notifications.Database", return_value=mock_db):
+            with patch("carrus.core.notifications.get_database", return_value=mock_db):
                 with patch("carrus.core.notifications.VersionTracker", return_value=mock_tracker):
                     service = NotificationService(test_config)
                     notifications = await service.check_updates()
@@ -287,6 +439,7 @@ class TestNotificationService:
         assert notifications[0].package_name == "TestApp"
         assert notifications[0].current_version == "1.0.0"
         assert notifications[0].new_version == "1.1.0"
+        mock_db.get_installed_versions.assert_not_called()
 
         # Check last_check was updated
         assert notification_config.last_check is not None
@@ -301,7 +454,7 @@ class TestNotificationService:
         mock_provider.notify = AsyncMock(return_value=True)
 
         async def run_test():
-            with patch("carrus.core.notifications.Database", return_value=mock_db):
+            with patch("carrus.core.notifications.get_database", return_value=mock_db):
                 service = NotificationService(test_config)
                 service.check_updates = mock_check
                 service.provider = mock_provider
@@ -315,12 +468,49 @@ class TestNotificationService:
         mock_check.assert_called_once()
         mock_provider.notify.assert_called_once_with(notification)
 
+    def test_notify_updates_concurrent(self, test_config, mock_db):
+        """Test notifications are sent concurrently up to the configured limit."""
+        test_config.notifications.max_concurrency = 2
+        notifications = [
+            Notification(
+                title="Test Update",
+                message="A new version is available",
+                package_name=f"App{i}",
+                current_version="1.0.0",
+                new_version="1.1.0",
+            )
+            for i in range(5)
+        ]
+        in_flight = 0
+        peak = 0
+
+        async def notify(notification):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if notification.package_name == "App3":
+                raise RuntimeError("boom")
+            return notification.package_name != "App4"
+
+        async def run_test():
+            with patch("carrus.core.notifications.get_database", return_value=mock_db):
+                service = NotificationService(test_config)
+                service.check_updates = AsyncMock(return_value=notifications)
+                service.provider = AsyncMock()
+                service.provider.notify = notify
+                return await service.notify_updates()
+
+        assert asyncio.run(run_test()) == 3
+        assert peak == 2
+
     def test_notify_updates_disabled(self, test_config, mock_db):
         """Test notify_updates method when disabled."""
         test_config.notifications.enabled = False
 
         async def run_test():
-            with patch("carrus.core.notifications.Database", return_value=mock_db):
+            with patch("carrus.core.notifications.get_database", return_value=mock_db):
                 service = NotificationService(test_config)
                 return await service.notify_updates()
 
@@ -331,7 +521,7 @@ class TestNotificationService:
 
     def test_set_notification_method(self, test_config, mock_db):
         """Test set_notification_method method."""
-        with patch("carrus.core.notifications.Database", return_value=mock_db):
+        with patch("carrus.core.notifications.get_database", return_value=mock_db):
             service = NotificationService(test_config)
 
             # Change to system
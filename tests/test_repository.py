@@ -1,13 +1,17 @@
 """Tests for repository management."""
 
+import sqlite3
 import tempfile
+from contextlib import closing
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+import yaml
 
 from carrus.core.config import get_repo_dir
 from carrus.core.manifests import Manifest
+from carrus.core.repository import RepositoryManager
 
 
 @pytest.fixture
@@ -58,3 +62,138 @@ def test_repo_dir_config():
         mock_config_dir.return_value = Path("/test/config/carrus")
         repo_dir = get_repo_dir()
         assert repo_dir == Path("/test/config/carrus/repos")
+
+
+def test_add_repository_indexes_manifests(mock_repo_dir):
+    """Test adding a repository indexes every manifest under its category."""
+    repo = mock_repo_dir / "repo"
+    (repo / "manifests" / "browsers").mkdir(parents=True)
+    (repo / "repo.yaml").write_text("name: community\ndescription: Community manifests\n")
+    (repo / "manifests" / "browsers" / "firefox.yaml").write_text("name: Firefox\n")
+    (repo / "manifests" / "rectangle.yaml").write_text("name: Rectangle\n")
+    (repo / "manifests" / "browsers" / "beta").mkdir()
+    (repo / "manifests" / "browsers" / "beta" / "firefox-beta.yaml").write_text("name: Beta\n")
+    (repo / "manifests" / "notes.txt").write_text("not a manifest\n")
+
+    manager = RepositoryManager(mock_repo_dir)
+    metadata = manager.add_repository(repo)
+
+    assert metadata.name == "community"
+    results = manager.search_manifests("")
+    assert [(r["name"], r["category"]) for r in results] == [
+        ("firefox", "browsers"),
+        ("firefox-beta", "browsers/beta"),
+        ("rectangle", "uncategorized"),
+    ]
+    assert [r["name"] for r in manager.search_manifests("fire")] == ["firefox", "firefox-beta"]
+    assert [r["name"] for r in manager.search_manifests("fire", "browsers/beta")] == [
+        "firefox-beta"
+    ]
+    assert [r["name"] for r in manager.search_manifests("", "uncategorized")] == ["rectangle"]
+    assert manager.list_manifests().row_count == 3
+    assert manager.list_manifests("browsers").row_count == 1
+    manager.close()
+
+
+def test_repository_db_uses_wal(mock_repo_dir):
+    """Test the repository catalog is switched to WAL journaling on init."""
+    RepositoryManager(mock_repo_dir).close()
+    with closing(sqlite3.connect(mock_repo_dir / "repos.db")) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_repository_manager_reuses_connection(mock_repo_dir):
+    """Test queries share one connection until the manager is closed."""
+    manager = RepositoryManager(mock_repo_dir)
+    conn = manager._get_conn()
+    manager.search_manifests("firefox")
+    manager.list_manifests()
+    assert manager._get_conn() is conn
+
+    manager.close()
+    assert manager._get_conn() is not conn
+    manager.close()
+
+
+def test_search_manifests_full_text(mock_repo_dir):
+    """Test search matches substrings through the FTS index and short terms via LIKE."""
+    repo = mock_repo_dir / "repo"
+    (repo / "manifests").mkdir(parents=True)
+    (repo / "repo.yaml").write_text("name: community\n")
+    for stem in ("firefox", "rectangle", 'say"hi'):
+        (repo / "manifests" / f"{stem}.yaml").write_text("name: x\n")
+
+    manager = RepositoryManager(mock_repo_dir)
+    manager.add_repository(repo)
+    assert manager._fts
+
+    assert [r["name"] for r in manager.search_manifests("FOX")] == ["firefox"]
+    assert [r["name"] for r in manager.search_manifests("ec")] == ["rectangle"]
+    assert [r["name"] for r in manager.search_manifests('y"h')] == ['say"hi']
+
+    # Re-adding replaces the rows and must keep the index in step
+    manager.add_repository(repo)
+    assert [r["name"] for r in manager.search_manifests("angle")] == ["rectangle"]
+    manager.close()
+
+
+def test_manifest_fields_are_indexed(mock_repo_dir):
+    """Test manifest description and version are stored as columns and searchable."""
+    repo = mock_repo_dir / "repo"
+    (repo / "manifests").mkdir(parents=True)
+    (repo / "repo.yaml").write_text("name: community\n")
+    (repo / "manifests" / "firefox.yaml").write_text(
+        'name: Firefox\nversion: "115.0"\ndescription: Web browser by Mozilla\n'
+    )
+    (repo / "manifests" / "broken.yaml").write_text("name: [unclosed\n")
+
+    manager = RepositoryManager(mock_repo_dir)
+    manager.add_repository(repo)
+
+    results = manager.search_manifests("mozilla")
+    assert results == [
+        {
+            "name": "firefox",
+            "category": "uncategorized",
+            "repo_name": "community",
+            "description": "Web browser by Mozilla",
+        }
+    ]
+    assert [r["name"] for r in manager.search_manifests("broken")] == ["broken"]
+    with manager._connect() as conn:
+        row = conn.execute(
+            "SELECT display_name, version FROM manifests WHERE name = 'firefox'"
+        ).fetchone()
+    assert row == ("Firefox", "115.0")
+    manager.close()
+
+
+def test_add_repository_reuses_parsed_yaml(mock_repo_dir):
+    """Test unchanged YAML files are parsed once across repeated adds."""
+    repo = mock_repo_dir / "repo"
+    (repo / "manifests").mkdir(parents=True)
+    (repo / "repo.yaml").write_text("name: community\n")
+    (repo / "manifests" / "firefox.yaml").write_text('name: Firefox\nversion: "115.0"\n')
+
+    manager = RepositoryManager(mock_repo_dir)
+    with patch("carrus.core.repository.yaml.load", wraps=yaml.load) as yaml_load:
+        manager.add_repository(repo)
+        manager.add_repository(repo)
+        assert yaml_load.call_count == 2
+
+        (repo / "manifests" / "firefox.yaml").write_text('name: Firefox\nversion: "116.0.1"\n')
+        manager.add_repository(repo)
+        assert yaml_load.call_count == 3
+    manager.close()
+
+
+def test_manifest_listing_needs_no_sort(mock_repo_dir):
+    """Test listings are read in category/name order from an index instead of sorted."""
+    manager = RepositoryManager(mock_repo_dir)
+    for term, category in (("", None), ("", "browsers"), ("ec", None)):
+        query, params = manager._manifest_query(term, category)
+        with manager._connect() as conn:
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+        assert any("idx_manifests_category_name" in step for step in plan)
+        assert not any("TEMP B-TREE" in step for step in plan)
+    manager.close()
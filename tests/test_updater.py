@@ -1,12 +1,19 @@
 """Tests for the Carrus updater module."""
 
+import asyncio
+import json
+import zipfile
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from carrus.core.database import Database
 from carrus.core.updater import (
+    FirefoxUpdateChecker,
+    MDMPackageBuilder,
+    UpdateChecker,
+    UpdateInfo,
     VersionTracker,
 )
 
@@ -133,6 +140,36 @@ class TestVersionTracker:
 
         assert True  # We're just ensuring the code can run synchronously
 
+    @pytest.mark.asyncio
+    async def test_check_for_updates_many(self, mock_db):
+        """Test batch checks look packages up once and record new versions together."""
+        mock_db.get_packages_by_names.return_value = {
+            "Firefox": {"id": 1, "name": "Firefox", "version": "123.0"},
+            "Slack": {"id": 2, "name": "Slack", "version": "4.0"},
+        }
+        firefox_update = UpdateInfo("123.0", "124.0", "https://example.com/firefox.dmg")
+        checker = MagicMock()
+        checker.check_update = AsyncMock(side_effect=[firefox_update, None])
+
+        with patch.object(UpdateChecker, "create_checker", AsyncMock(return_value=checker)):
+            results = await VersionTracker(mock_db).check_for_updates_many(
+                [("firefox", "Firefox"), ("generic", "Slack"), ("generic", "Missing")]
+            )
+
+        assert results == {"Firefox": firefox_update, "Slack": None, "Missing": None}
+        mock_db.get_packages_by_names.assert_called_once_with(["Firefox", "Slack", "Missing"])
+        mock_db.add_package_versions.assert_called_once_with(
+            [
+                {
+                    "package_id": 1,
+                    "version": "124.0",
+                    "url": "https://example.com/firefox.dmg",
+                    "release_date": None,
+                }
+            ]
+        )
+        mock_db.add_package_version.assert_not_called()
+
     def test_mark_version_installed(self, mock_db):
         """Test marking a version as installed."""
         # Set up mock
@@ -162,6 +199,21 @@ class TestVersionTracker:
         mock_db.update_package_status.assert_called_once_with(1, "installed")
         mock_db.add_install_history.assert_called_once()
 
+    def test_get_available_updates(self, mock_db):
+        """Test only candidates with a newer latest version are reported."""
+        firefox = {"id": 1, "name": "Firefox"}
+        chrome = {"id": 2, "name": "Chrome"}
+        mock_db.get_update_candidates.return_value = [
+            (firefox, {"id": 10, "version": "124.0"}, "123.0"),
+            (chrome, {"id": 20, "version": "1.0"}, "1.1"),
+        ]
+
+        updates = VersionTracker(mock_db).get_available_updates()
+
+        assert updates == [(firefox, {"id": 10, "version": "124.0"}, "123.0")]
+        mock_db.get_installed_version.assert_not_called()
+        mock_db.get_latest_version.assert_not_called()
+
     def test_version_comparison(self):
         """Test version comparison logic."""
         tracker = VersionTracker(MagicMock())
@@ -182,3 +234,121 @@ class TestVersionTracker:
 
         # Invalid versions fallback
         assert tracker._compare_versions("latest", "stable") == 1 if "latest" > "stable" else -1
+
+
+class FakeFirefoxSession:
+    """aiohttp session stand-in that serves the product-details JSON."""
+
+    def __init__(self, latest):
+        self.latest = latest
+        self.requests = 0
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def get(self, url):
+        self.requests += 1
+        response = MagicMock(status=200)
+        response.__aenter__.return_value = response
+
+        async def json():
+            await asyncio.sleep(0)
+            return {"LATEST_FIREFOX_VERSION": self.latest}
+
+        response.json = json
+        return response
+
+
+class TestFirefoxUpdateChecker:
+    """Test the Firefox update checker."""
+
+    @pytest.mark.asyncio
+    async def test_latest_version_is_fetched_once(self):
+        """Test concurrent and repeated checks share one request to Mozilla."""
+        FirefoxUpdateChecker.clear_cache()
+        session = FakeFirefoxSession("124.0")
+        checker = FirefoxUpdateChecker()
+
+        with patch("aiohttp.ClientSession", return_value=session):
+            results = await asyncio.gather(*(checker.check_update("123.0") for _ in range(5)))
+            assert await checker.check_update("124.0") is None
+
+        assert session.requests == 1
+        assert {info.latest_version for info in results} == {"124.0"}
+        FirefoxUpdateChecker.clear_cache()
+        await UpdateChecker.aclose()
+
+    @pytest.mark.asyncio
+    async def test_checkers_share_session(self):
+        """Test update checks reuse one session until it is closed."""
+        FirefoxUpdateChecker.clear_cache()
+        session = FakeFirefoxSession("124.0")
+
+        with patch("aiohttp.ClientSession", return_value=session) as session_cls:
+            await FirefoxUpdateChecker().check_update("123.0")
+            FirefoxUpdateChecker.clear_cache()
+            await FirefoxUpdateChecker().check_update("123.0")
+            assert session_cls.call_count == 1
+            assert session.requests == 2
+
+            await UpdateChecker.aclose()
+            assert session.closed
+            assert UpdateChecker._session is None
+        FirefoxUpdateChecker.clear_cache()
+
+
+class TestMDMPackageBuilder:
+    """Test Kandji package assembly."""
+
+    @pytest.mark.asyncio
+    async def test_build_kandji_package_writes_package_files(self, tmp_path):
+        """Test pkginfo and install scripts are written into the package directory."""
+        app_path = tmp_path / "Applications" / "Firefox.app"
+        app_path.mkdir(parents=True)
+        proc = MagicMock()
+        proc.communicate = AsyncMock(return_value=(b"", b""))
+
+        with patch("asyncio.create_subprocess_exec", return_value=proc) as create_proc:
+            builder = MDMPackageBuilder(tmp_path / "out")
+            final_path = await builder.build_kandji_package(app_path, "Firefox", "124.0", {})
+
+        pkg_dir = tmp_path / "out" / "mdm_packages" / "Firefox-124.0"
+        pkginfo = json.loads((pkg_dir / "pkginfo.json").read_text())
+        assert pkginfo["name"] == "Firefox" and pkginfo["version"] == "124.0"
+        install_check = pkg_dir / "installcheck.sh"
+        assert "/Applications/Firefox.app" in install_check.read_text()
+        assert install_check.stat().st_mode & 0o777 == 0o755
+        assert [c.args[0] for c in create_proc.call_args_list] == ["pkgbuild"]
+
+        with zipfile.ZipFile(final_path) as zf:
+            assert set(zf.namelist()) == {"pkginfo.json", "installcheck.sh"}
+            assert zf.getinfo("installcheck.sh").external_attr >> 16 & 0o777 == 0o755
+
+    @pytest.mark.asyncio
+    async def test_build_kandji_package_writes_files_before_pkgbuild(self, tmp_path):
+        """Test package files exist before pkgbuild reads an enclosing root."""
+        # Mirrors build-mdm --output-dir: the app and mdm_packages share a parent
+        app_path = tmp_path / "Firefox.app"
+        app_path.mkdir()
+        pkg_dir = tmp_path / "mdm_packages" / "Firefox-124.0"
+        seen_at_spawn = {}
+
+        async def fake_exec(*args, **kwargs):
+            seen_at_spawn.setdefault("files", sorted(p.name for p in pkg_dir.iterdir()))
+            proc = MagicMock()
+            proc.communicate = AsyncMock(return_value=(b"", b""))
+            return proc
+
+        with patch("asyncio.create_subprocess_exec", side_effect=fake_exec) as create_proc:
+            builder = MDMPackageBuilder(app_path.parent)
+            await builder.build_kandji_package(app_path, "Firefox", "124.0", {})
+
+        assert create_proc.call_args_list[0].args[2] == str(tmp_path)
+        assert seen_at_spawn["files"] == ["installcheck.sh", "pkginfo.json"]